@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import random
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from functools import lru_cache
 
 from app.agents.model_router import GenerationRequest, ModelRouter
+from app.core.config import settings
+from app.core.simulation import SimulationProfile, Simulator, parse_simulation_config
 from app.models.entities import Sentiment
 
 
@@ -22,6 +25,33 @@ class ADKProviderAdapter:
         return f"[{target.model}] {req.instruction[:120]}"
 
 
+class SimulatedProviderAdapter(ADKProviderAdapter):
+    """Provider stand-in with per-target latency distributions, error rates and 429 windows."""
+
+    def __init__(self, profile: SimulationProfile) -> None:
+        self.profile = profile
+        self.simulators: dict[str, Simulator] = {}
+
+    def call(self, target, req: GenerationRequest) -> str:  # noqa: ANN001
+        key = f"{target.provider}:{target.model}:{target.api_key}"
+        simulator = self.simulators.get(key)
+        if simulator is None:
+            seed = None if self.profile.seed is None else self.profile.seed + target.priority
+            simulator = self.simulators.setdefault(key, Simulator(replace(self.profile, seed=seed)))
+        simulator.run()
+        return super().call(target, req)
+
+
+@lru_cache(maxsize=4)
+def _simulated_provider(raw: str) -> SimulatedProviderAdapter | None:
+    profile = parse_simulation_config(raw)["provider"]
+    return SimulatedProviderAdapter(profile) if profile else None
+
+
+def default_provider() -> ADKProviderAdapter:
+    return _simulated_provider(settings.simulation_config_raw) or ADKProviderAdapter()
+
+
 class OutreachTemplateAgent:
     def __init__(self, router: ModelRouter, provider: ADKProviderAdapter) -> None:
         self.router = router
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import time
 from collections import defaultdict
 from dataclasses import dataclass
 from typing import Callable
 
 from app.core.config import ModelTarget, settings
+from app.core.metrics import LLM_FAILOVERS, LLM_FAILURES, LLM_REQUEST_SECONDS
 
 
 @dataclass(slots=True)
@@ -31,11 +33,18 @@ class ModelRouter:
     def generate(self, req: GenerationRequest, provider_call: Callable[[ModelTarget, GenerationRequest], str]) -> str:
         last_error: Exception | None = None
         for target in self.ordered_targets(req.reserve_premium):
+            label = f"{target.provider}:{target.model}"
+            if last_error is not None:
+                LLM_FAILOVERS.inc()
+            start = time.perf_counter()
             try:
                 output = provider_call(target, req)
-                self.usage[f"{target.provider}:{target.model}"] += 1
+                LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, target=label, outcome="ok")
+                self.usage[label] += 1
                 return output
             except Exception as exc:  # noqa: BLE001
+                LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, target=label, outcome="error")
+                LLM_FAILURES.inc(target=label)
                 last_error = exc
                 continue
         raise RuntimeError(f"All model targets failed. last_error={last_error}")
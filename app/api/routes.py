@@ -1,28 +1,67 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, File, Form, Request, UploadFile
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import HTMLResponse, PlainTextResponse, RedirectResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
 from fastapi.templating import Jinja2Templates
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.metrics import REGISTRY, profiled
+from app.db.data_version import VersionedCache, data_version
 from app.db.session import get_db
-from app.models.entities import Alert, Lead, ReplyMessage
-from app.models.schemas import IncomingReply
+from app.models.entities import Alert, Lead, LeadStatus, ReplyMessage
+from app.models.schemas import (
+    AlertPage,
+    IncomingReply,
+    LeadImportResult,
+    LeadPage,
+    LeadSearchPage,
+    ReplyPage,
+    ReplySearchPage,
+    TemplateStatsOut,
+)
 from app.services.campaign_service import CampaignService
 from app.services.lead_importer import LeadImporter
+from app.services.pagination import keyset_page
+from app.services.retention import RetentionService
+from app.services.search import SearchService
+from app.services.template_stats import TemplateStatsService
 
-router = APIRouter()
+
+class InstrumentedRoute(APIRoute):
+    def __init__(self, path: str, endpoint, **kwargs) -> None:  # noqa: ANN001
+        super().__init__(path, profiled(endpoint), **kwargs)
+
+
+router = APIRouter(route_class=InstrumentedRoute)
 templates = Jinja2Templates(directory="app/templates")
 
 
+dashboard_cache = VersionedCache(data_version)
+
+
 @router.get("/", response_class=HTMLResponse)
 def dashboard(request: Request, db: Session = Depends(get_db)):
+    if not settings.dashboard_cache_enabled:
+        return HTMLResponse(_render_dashboard(request, db))
+    etag = data_version.etag("dashboard")
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in (tag.strip() for tag in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=304, headers=headers)
+    body = dashboard_cache.get_or_compute("dashboard", lambda: _render_dashboard(request, db))
+    return HTMLResponse(body, headers=headers)
+
+
+def _render_dashboard(request: Request, db: Session) -> bytes:
     service = CampaignService(db)
-    metrics = service.metrics()
+    metrics = dashboard_cache.get_or_compute("metrics", service.metrics)
     leads = db.scalars(select(Lead).order_by(Lead.created_at.desc()).limit(20)).all()
     alerts = db.scalars(select(Alert).order_by(Alert.created_at.desc()).limit(10)).all()
     replies = db.scalars(select(ReplyMessage).order_by(ReplyMessage.received_at.desc()).limit(10)).all()
+    best_templates = TemplateStatsService(db).best(limit=5)
     return templates.TemplateResponse(
         request,
         "dashboard.html",
@@ -31,8 +70,94 @@ def dashboard(request: Request, db: Session = Depends(get_db)):
             "leads": leads,
             "alerts": alerts,
             "replies": replies,
+            "best_templates": best_templates,
         },
-    )
+    ).body
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/api/leads", response_model=LeadPage)
+def list_leads(
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    status: LeadStatus | None = None,
+    niche: str | None = None,
+    company: str | None = None,
+    db: Session = Depends(get_db),
+):
+    stmt = select(Lead)
+    if status is not None:
+        stmt = stmt.where(Lead.status == status)
+    if niche:
+        stmt = stmt.where(Lead.niche == niche)
+    if company:
+        stmt = stmt.where(Lead.company == company)
+    try:
+        items, next_cursor = keyset_page(db, stmt, Lead.created_at, Lead.id, cursor, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/api/alerts", response_model=AlertPage)
+def list_alerts(cursor: str | None = None, limit: int = Query(50, ge=1, le=200), db: Session = Depends(get_db)):
+    try:
+        items, next_cursor = keyset_page(db, select(Alert), Alert.created_at, Alert.id, cursor, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/api/replies", response_model=ReplyPage)
+def list_replies(cursor: str | None = None, limit: int = Query(50, ge=1, le=200), db: Session = Depends(get_db)):
+    try:
+        items, next_cursor = keyset_page(
+            db, select(ReplyMessage), ReplyMessage.received_at, ReplyMessage.id, cursor, limit
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/api/search/leads", response_model=LeadSearchPage)
+def search_leads(
+    q: str,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    items = SearchService(db).search_leads(q, limit, offset)
+    return {"items": items, "next_offset": offset + limit if len(items) == limit else None}
+
+
+@router.get("/api/search/replies", response_model=ReplySearchPage)
+def search_replies(
+    q: str,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    items = SearchService(db).search_replies(q, limit, offset)
+    return {"items": items, "next_offset": offset + limit if len(items) == limit else None}
+
+
+@router.get("/api/templates/best", response_model=list[TemplateStatsOut])
+def best_templates(limit: int = Query(10, ge=1, le=100), db: Session = Depends(get_db)):
+    return TemplateStatsService(db).best(limit)
+
+
+@router.get("/api/leads/{lead_id}/archive")
+def lead_archive(lead_id: int, db: Session = Depends(get_db)):
+    return {"items": RetentionService(db).archived_messages(lead_id)}
+
+
+@router.post("/maintenance/retention")
+def run_retention(db: Session = Depends(get_db)):
+    return RetentionService(db).run()
 
 
 @router.post("/leads/import")
@@ -40,10 +165,21 @@ async def import_leads(file: UploadFile = File(...), db: Session = Depends(get_d
     payload = await file.read()
     importer = LeadImporter(db)
     rows = importer.parse(file.filename, payload)
-    _ = importer.import_rows(rows)
+    _ = await run_in_threadpool(importer.import_rows, rows)
     return RedirectResponse(url="/", status_code=303)
 
 
+@router.post("/api/leads/import", response_model=LeadImportResult)
+async def import_leads_report(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    payload = await file.read()
+    importer = LeadImporter(db)
+    try:
+        rows = importer.parse(file.filename, payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return await run_in_threadpool(importer.import_rows, rows)
+
+
 @router.post("/templates/generate")
 def generate_templates(objective: str = Form(...), niche: str = Form(""), db: Session = Depends(get_db)):
     service = CampaignService(db)
@@ -68,7 +204,12 @@ def send_followups(db: Session = Depends(get_db)):
 @router.post("/inbox/reply")
 def ingest_reply(payload: IncomingReply, db: Session = Depends(get_db)):
     service = CampaignService(db)
-    service.process_incoming_reply(payload.lead_email, payload.raw_body)
+    service.process_incoming_reply(
+        payload.lead_email,
+        payload.raw_body,
+        in_reply_to=payload.in_reply_to,
+        references=payload.references,
+    )
     return {"status": "ok"}
 
 
@@ -79,6 +220,13 @@ def approve_reply(lead_id: int, db: Session = Depends(get_db)):
     return {"sent": ok}
 
 
+@router.post("/reply/draft/{reply_id}")
+def edit_reply_draft(reply_id: int, subject: str = Form(...), body: str = Form(...), db: Session = Depends(get_db)):
+    service = CampaignService(db)
+    ok = service.edit_suggested_reply(reply_id, subject, body)
+    return {"updated": ok}
+
+
 @router.get("/unsubscribe/{email}", response_class=HTMLResponse)
 def unsubscribe_page(email: str, request: Request):
     return templates.TemplateResponse(request, "unsubscribe.html", {"email": email})
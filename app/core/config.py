@@ -25,6 +25,17 @@ class Settings:
     reply_auto_send_delay_minutes: int = int(
         os.getenv("MIDAS_REPLY_AUTO_SEND_DELAY_MINUTES", "60")
     )
+    message_body_storage: str = os.getenv("MIDAS_MESSAGE_BODY_STORAGE", "compact")
+    alert_retention_days: int = int(os.getenv("MIDAS_ALERT_RETENTION_DAYS", "30"))
+    message_retention_days: int = int(os.getenv("MIDAS_MESSAGE_RETENTION_DAYS", "180"))
+    retention_batch_size: int = int(os.getenv("MIDAS_RETENTION_BATCH_SIZE", "500"))
+    profiling_header_enabled: bool = os.getenv("MIDAS_PROFILING_HEADER_ENABLED", "false").lower() == "true"
+    simulation_config_raw: str = os.getenv("MIDAS_SIMULATION", "")
+    import_validation_workers: int = int(os.getenv("MIDAS_IMPORT_VALIDATION_WORKERS", "0"))
+    import_parallel_threshold: int = int(os.getenv("MIDAS_IMPORT_PARALLEL_THRESHOLD", "20000"))
+    followup_cadence_raw: str = os.getenv("MIDAS_FOLLOWUP_CADENCE", "2,3,4,5")
+    reply_auto_send_enabled: bool = os.getenv("MIDAS_REPLY_AUTO_SEND_ENABLED", "false").lower() == "true"
+    dashboard_cache_enabled: bool = os.getenv("MIDAS_DASHBOARD_CACHE_ENABLED", "true").lower() == "true"
     model_config_raw: str = os.getenv(
         "MIDAS_MODEL_CONFIG",
         json.dumps(
@@ -47,10 +58,12 @@ class Settings:
         ),
     )
     model_targets: list[ModelTarget] = field(default_factory=list)
+    followup_cadence: list[int] = field(default_factory=list)
 
     def __post_init__(self) -> None:
         parsed: list[dict[str, Any]] = json.loads(self.model_config_raw)
         self.model_targets = [ModelTarget(**item) for item in sorted(parsed, key=lambda x: x["priority"])]
+        self.followup_cadence = [int(d) for d in self.followup_cadence_raw.split(",") if d.strip()]
 
 
 settings = Settings()
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import cProfile
+import functools
+import inspect
+import io
+import logging
+import pstats
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("midas.profile")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_str(labelnames: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        with self._lock:
+            self._values[key] += amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels[n]) for n in self.labelnames), 0.0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            if not self.labelnames and not self._values:
+                lines.append(f"{self.name} 0.0")
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_str(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[idx] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, counts in sorted(self._counts.items()):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, float("inf")), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    le_label = f'le="{le}"'
+                    lines.append(f"{self.name}_bucket{_label_str(self.labelnames, key, le_label)} {cumulative}")
+                lines.append(f"{self.name}_sum{_label_str(self.labelnames, key)} {self._sums[key]}")
+                lines.append(f"{self.name}_count{_label_str(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.metrics: list[Counter | Histogram] = []
+
+    def register(self, metric: Counter | Histogram) -> Any:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self.metrics for line in metric.render()) + "\n"
+
+
+REGISTRY = Registry()
+
+EMAIL_SEND_SECONDS = REGISTRY.register(
+    Histogram("midas_email_send_seconds", "EmailGateway.send latency.", ("email_type",))
+)
+EMAILS_SENT = REGISTRY.register(Counter("midas_emails_sent_total", "Emails handed to the gateway.", ("email_type",)))
+QUOTA_REJECTIONS = REGISTRY.register(
+    Counter("midas_mailbox_quota_rejections_total", "Sends refused by the daily mailbox limit.")
+)
+LLM_REQUEST_SECONDS = REGISTRY.register(
+    Histogram("midas_llm_request_seconds", "Provider call latency per model target.", ("target", "outcome"))
+)
+LLM_FAILURES = REGISTRY.register(Counter("midas_llm_failures_total", "Failed provider calls per target.", ("target",)))
+LLM_FAILOVERS = REGISTRY.register(
+    Counter("midas_llm_failovers_total", "Times ModelRouter moved on to the next target after a failure.")
+)
+BATCH_SECONDS = REGISTRY.register(Histogram("midas_campaign_batch_seconds", "CampaignService batch duration.", ("batch",)))
+HTTP_REQUEST_SECONDS = REGISTRY.register(
+    Histogram("midas_http_request_seconds", "Route latency.", ("method", "route", "status"))
+)
+DB_QUERIES_PER_REQUEST = REGISTRY.register(
+    Histogram(
+        "midas_db_queries_per_request",
+        "SQL statements executed per HTTP request.",
+        ("route",),
+        buckets=(1, 2, 5, 10, 20, 50, 100, 250, 1000),
+    )
+)
+DB_SECONDS_PER_REQUEST = REGISTRY.register(
+    Histogram("midas_db_seconds_per_request", "Time spent in SQL per HTTP request.", ("route",))
+)
+
+
+@dataclass(slots=True)
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("midas_query_stats", default=None)
+_profile_requested: ContextVar[bool] = ContextVar("midas_profile_requested", default=False)
+_hooks_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+    conn.info.setdefault("midas_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+    start = conn.info["midas_query_start"].pop()
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += time.perf_counter() - start
+
+
+def _handle_error(exception_context) -> None:  # noqa: ANN001
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("midas_query_start"):
+        conn.info["midas_query_start"].pop()
+
+
+def install_query_hooks() -> None:
+    """Count and time every SQL statement on any engine into the current ``track_queries`` scope."""
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+    _hooks_installed = True
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+@contextmanager
+def profile_scope(enabled: bool) -> Iterator[None]:
+    token = _profile_requested.set(enabled)
+    try:
+        yield
+    finally:
+        _profile_requested.reset(token)
+
+
+def _dump_profile(profiler: cProfile.Profile, name: str) -> None:
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(25)
+    logger.info("cProfile summary for %s\n%s", name, out.getvalue())
+
+
+def profiled(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a route endpoint so it runs under cProfile when the request asked for it.
+
+    The profiler has to be enabled inside the endpoint itself: sync routes execute on a
+    threadpool worker and cProfile only sees the thread that enabled it.
+    """
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _profile_requested.get():
+                return await endpoint(*args, **kwargs)
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                profiler.disable()
+                _dump_profile(profiler, endpoint.__name__)
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if not _profile_requested.get():
+            return endpoint(*args, **kwargs)
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            profiler.disable()
+            _dump_profile(profiler, endpoint.__name__)
+
+    return wrapper
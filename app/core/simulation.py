@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class SimulationProfile:
+    """Behaviour of a simulated backend.
+
+    Latency is log-normal around ``latency_median_ms`` (``latency_sigma`` = 0 makes it fixed).
+    ``rate_limit`` calls are allowed per ``rate_limit_window_s``; calls beyond that fail like a 429.
+    """
+
+    latency_median_ms: float = 0.0
+    latency_sigma: float = 0.5
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    timeout_ms: float = 30_000.0
+    rate_limit: int = 0
+    rate_limit_window_s: float = 60.0
+    seed: int | None = None
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, Any] | None) -> SimulationProfile | None:
+        return cls(**raw) if raw is not None else None
+
+
+class SimulationError(RuntimeError):
+    def __init__(self, kind: str, message: str) -> None:
+        super().__init__(message)
+        self.kind = kind
+
+
+class Simulator:
+    """Thread-safe, seedable source of latency, failures and rate-limit rejections."""
+
+    def __init__(self, profile: SimulationProfile, sleep=time.sleep) -> None:  # noqa: ANN001
+        self.profile = profile
+        self.rng = random.Random(profile.seed)
+        self._sleep = sleep
+        self._calls: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def _admit(self, now: float) -> bool:
+        if self.profile.rate_limit <= 0:
+            return True
+        window_start = now - self.profile.rate_limit_window_s
+        while self._calls and self._calls[0] <= window_start:
+            self._calls.popleft()
+        if len(self._calls) >= self.profile.rate_limit:
+            return False
+        self._calls.append(now)
+        return True
+
+    def run(self) -> None:
+        """Block for one simulated call; raise SimulationError for injected failures."""
+        with self._lock:
+            admitted = self._admit(time.monotonic())
+            roll = self.rng.random()
+            latency_ms = 0.0
+            if self.profile.latency_median_ms > 0:
+                latency_ms = self.profile.latency_median_ms * self.rng.lognormvariate(0.0, self.profile.latency_sigma)
+        if not admitted:
+            raise SimulationError("rate_limited", "429 Too Many Requests (simulated rate-limit window)")
+        if roll < self.profile.timeout_rate:
+            self._sleep(self.profile.timeout_ms / 1000)
+            raise SimulationError("timeout", "Timed out (simulated)")
+        self._sleep(latency_ms / 1000)
+        if roll < self.profile.timeout_rate + self.profile.error_rate:
+            raise SimulationError("error", "Backend error (simulated)")
+
+
+def parse_simulation_config(raw: str) -> dict[str, SimulationProfile | None]:
+    parsed: dict[str, Any] = json.loads(raw) if raw else {}
+    return {
+        "provider": SimulationProfile.from_dict(parsed.get("provider")),
+        "gateway": SimulationProfile.from_dict(parsed.get("gateway")),
+    }
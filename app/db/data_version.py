@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+_DIRTY_KEY = "midas_data_dirty"
+
+
+class DataVersion:
+    """Process-wide counter bumped after every committed write made through an ORM Session.
+
+    Readers cache derived views against ``token`` and skip the database while it is unchanged.
+    ``current`` only counts this process's writes; once ``watch`` is given a SQLite file engine,
+    ``token`` also carries SQLite's ``PRAGMA data_version``, which moves whenever another
+    connection (a cron script, a migration, another worker) commits to the file. Other
+    backends have no such signal, so their writes from other processes are not seen.
+    """
+
+    def __init__(self) -> None:
+        self.boot_id = f"{int(time.time() * 1000):x}"
+        self._value = 0
+        self._lock = threading.Lock()
+        self._watched: str | None = None
+        self._watcher: sqlite3.Connection | None = None
+
+    @property
+    def current(self) -> int:
+        return self._value
+
+    @property
+    def token(self) -> str:
+        if self._watched is None:
+            return str(self._value)
+        with self._lock:
+            if self._watcher is None:
+                try:
+                    # Read-only, so watching never creates the file before ``init_db`` does.
+                    self._watcher = sqlite3.connect(f"{self._watched}?mode=ro", uri=True, check_same_thread=False)
+                except sqlite3.OperationalError:
+                    return str(self._value)
+            external = self._watcher.execute("PRAGMA data_version").fetchone()[0]
+        return f"{self._value}.{external}"
+
+    def bump(self) -> int:
+        with self._lock:
+            self._value += 1
+            return self._value
+
+    def watch(self, engine: Engine) -> None:
+        """Follow commits made by any connection to ``engine``'s database file, where supported."""
+        database = engine.url.database
+        if engine.dialect.name != "sqlite" or not database or database == ":memory:" or database.startswith("file:"):
+            return
+        # Polled on a dedicated connection: data_version only reports commits made by *other* connections.
+        self._watched = Path(database).resolve().as_uri()
+
+    def etag(self, scope: str) -> str:
+        return f'W/"{scope}-{self.boot_id}-{self.token}"'
+
+
+class VersionedCache:
+    def __init__(self, version: DataVersion) -> None:
+        self.version = version
+        self._entries: dict[str, tuple[str, Any]] = {}
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        version = self.version.token
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        # Computed after reading the version, so the value is at least as new as the key it is stored under.
+        value = compute()
+        self._entries[key] = (version, value)
+        return value
+
+
+data_version = DataVersion()
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush(session: Session, flush_context) -> None:  # noqa: ANN001
+    session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_bulk_dml(orm_execute_state) -> None:  # noqa: ANN001
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session: Session) -> None:
+    if session.info.pop(_DIRTY_KEY, False):
+        data_version.bump()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_on_rollback(session: Session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+# External-content FTS5 tables: the index stores only tokens and reads text from the base
+# tables. Triggers keep it in sync for ORM, bulk and raw-SQL writes alike; the lead UPDATE
+# trigger fires only for indexed columns so status/cadence updates don't churn the index.
+_SQLITE_DDL = {
+    "leads_fts": [
+        "CREATE VIRTUAL TABLE leads_fts USING fts5("
+        "name, company, position, niche, content='leads', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        "INSERT INTO leads_fts(leads_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 2.0, 2.0)')",
+        "CREATE TRIGGER IF NOT EXISTS leads_fts_ai AFTER INSERT ON leads BEGIN "
+        "INSERT INTO leads_fts(rowid, name, company, position, niche) "
+        "VALUES (new.id, new.name, new.company, new.position, new.niche); END",
+        "CREATE TRIGGER IF NOT EXISTS leads_fts_ad AFTER DELETE ON leads BEGIN "
+        "INSERT INTO leads_fts(leads_fts, rowid, name, company, position, niche) "
+        "VALUES ('delete', old.id, old.name, old.company, old.position, old.niche); END",
+        "CREATE TRIGGER IF NOT EXISTS leads_fts_au AFTER UPDATE OF name, company, position, niche ON leads BEGIN "
+        "INSERT INTO leads_fts(leads_fts, rowid, name, company, position, niche) "
+        "VALUES ('delete', old.id, old.name, old.company, old.position, old.niche); "
+        "INSERT INTO leads_fts(rowid, name, company, position, niche) "
+        "VALUES (new.id, new.name, new.company, new.position, new.niche); END",
+        "INSERT INTO leads_fts(leads_fts) VALUES ('rebuild')",
+    ],
+    "reply_messages_fts": [
+        "CREATE VIRTUAL TABLE reply_messages_fts USING fts5("
+        "raw_body, content='reply_messages', content_rowid='id', tokenize='porter unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER IF NOT EXISTS reply_messages_fts_ai AFTER INSERT ON reply_messages BEGIN "
+        "INSERT INTO reply_messages_fts(rowid, raw_body) VALUES (new.id, new.raw_body); END",
+        "CREATE TRIGGER IF NOT EXISTS reply_messages_fts_ad AFTER DELETE ON reply_messages BEGIN "
+        "INSERT INTO reply_messages_fts(reply_messages_fts, rowid, raw_body) VALUES ('delete', old.id, old.raw_body); END",
+        "CREATE TRIGGER IF NOT EXISTS reply_messages_fts_au AFTER UPDATE OF raw_body ON reply_messages BEGIN "
+        "INSERT INTO reply_messages_fts(reply_messages_fts, rowid, raw_body) VALUES ('delete', old.id, old.raw_body); "
+        "INSERT INTO reply_messages_fts(rowid, raw_body) VALUES (new.id, new.raw_body); END",
+        "INSERT INTO reply_messages_fts(reply_messages_fts) VALUES ('rebuild')",
+    ],
+}
+
+# PostgreSQL keeps a generated tsvector next to the row, so no triggers are needed.
+_POSTGRES_DDL = [
+    "ALTER TABLE leads ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(company, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(position, '') || ' ' || coalesce(niche, '')), 'C')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_leads_search_vector ON leads USING GIN (search_vector)",
+    "ALTER TABLE reply_messages ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "to_tsvector('english', raw_body)) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_reply_messages_search_vector ON reply_messages USING GIN (search_vector)",
+]
+
+
+def _ensure_sqlite(conn: Connection) -> None:
+    existing = {
+        row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE '%_fts'"))
+    }
+    for table, statements in _SQLITE_DDL.items():
+        if table in existing:
+            continue
+        for statement in statements:
+            conn.execute(text(statement))
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """Create the full-text index for leads and replies if the backend supports it."""
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            _ensure_sqlite(conn)
+        elif engine.dialect.name == "postgresql":
+            for statement in _POSTGRES_DDL:
+                conn.execute(text(statement))
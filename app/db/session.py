@@ -4,8 +4,10 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from app.core.config import settings
+from app.db.data_version import data_version  # also registers the write-tracking Session events
 
 engine = create_engine(settings.db_url, future=True)
+data_version.watch(engine)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
 Base = declarative_base()
 
@@ -19,9 +21,11 @@ def get_db():
 
 
 def init_db() -> None:
+    from app.db.search_index import ensure_search_index
     from app.models import entities  # noqa: F401
 
     Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
 
 
 def get_session() -> Session:
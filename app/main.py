@@ -1,16 +1,54 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 
 from app.api.routes import router
+from app.core.config import settings
+from app.core.metrics import (
+    DB_QUERIES_PER_REQUEST,
+    DB_SECONDS_PER_REQUEST,
+    HTTP_REQUEST_SECONDS,
+    install_query_hooks,
+    profile_scope,
+    track_queries,
+)
 from app.db.session import init_db
+from app.services.email_validation import shutdown_validation_pool
+from app.services.reply_scheduler import reply_auto_sender
 
 app = FastAPI(title="Midas")
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 app.include_router(router)
+install_query_hooks()
+
+
+@app.middleware("http")
+async def instrument_request(request: Request, call_next):
+    profile = settings.profiling_header_enabled and request.headers.get("x-midas-profile") == "1"
+    start = time.perf_counter()
+    with track_queries() as queries, profile_scope(profile):
+        response = await call_next(request)
+    route = request.scope.get("route")
+    path = route.path if route is not None else "unmatched"
+    HTTP_REQUEST_SECONDS.observe(
+        time.perf_counter() - start, method=request.method, route=path, status=str(response.status_code)
+    )
+    DB_QUERIES_PER_REQUEST.observe(queries.count, route=path)
+    DB_SECONDS_PER_REQUEST.observe(queries.seconds, route=path)
+    return response
 
 
 @app.on_event("startup")
 def on_startup() -> None:
     init_db()
+    if settings.reply_auto_send_enabled:
+        reply_auto_sender.start()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    reply_auto_sender.stop()
+    shutdown_validation_pool()
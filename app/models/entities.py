@@ -3,7 +3,7 @@ from __future__ import annotations
 import enum
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Enum, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Enum, Float, ForeignKey, Index, Integer, LargeBinary, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.session import Base
@@ -32,10 +32,17 @@ class Sentiment(str, enum.Enum):
 
 class Lead(Base):
     __tablename__ = "leads"
+    __table_args__ = (
+        Index("ix_leads_created_at_id", "created_at", "id"),
+        Index("ix_leads_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_leads_niche_created_at_id", "niche", "created_at", "id"),
+        Index("ix_leads_company_created_at_id", "company", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(150), nullable=False)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
+    canonical_email: Mapped[str | None] = mapped_column(String(255), unique=True, nullable=True, index=True)
     company: Mapped[str | None] = mapped_column(String(150), nullable=True)
     position: Mapped[str | None] = mapped_column(String(150), nullable=True)
     niche: Mapped[str | None] = mapped_column(String(150), nullable=True)
@@ -43,6 +50,9 @@ class Lead(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     last_contacted_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     opt_out: Mapped[bool] = mapped_column(Boolean, default=False)
+    touch_count: Mapped[int] = mapped_column(Integer, default=0)
+    # Set while a follow-up is scheduled; cleared on reply, opt-out or when the cadence ends.
+    next_touch_due_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
 
     emails: Mapped[list[EmailMessage]] = relationship("EmailMessage", back_populates="lead")
 
@@ -63,6 +73,27 @@ class EmailTemplate(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
+class TemplateStats(Base):
+    """Running per-template counters, updated as sends, replies and opt-outs are recorded.
+
+    Replies and opt-outs are attributed to the outreach template that opened the thread and
+    counted once per lead.
+    """
+
+    __tablename__ = "template_stats"
+
+    template_id: Mapped[int] = mapped_column(ForeignKey("email_templates.id"), primary_key=True)
+    sends: Mapped[int] = mapped_column(Integer, default=0)
+    replies: Mapped[int] = mapped_column(Integer, default=0)
+    positive_replies: Mapped[int] = mapped_column(Integer, default=0)
+    neutral_replies: Mapped[int] = mapped_column(Integer, default=0)
+    negative_replies: Mapped[int] = mapped_column(Integer, default=0)
+    opt_outs: Mapped[int] = mapped_column(Integer, default=0)
+    reply_seconds_total: Mapped[float] = mapped_column(Float, default=0.0)
+
+    template: Mapped[EmailTemplate] = relationship("EmailTemplate")
+
+
 class EmailMessage(Base):
     __tablename__ = "email_messages"
 
@@ -71,28 +102,38 @@ class EmailMessage(Base):
     template_id: Mapped[int | None] = mapped_column(ForeignKey("email_templates.id"), nullable=True)
     email_type: Mapped[EmailType] = mapped_column(Enum(EmailType), index=True)
     subject: Mapped[str] = mapped_column(String(255), nullable=False)
-    body: Mapped[str] = mapped_column(Text, nullable=False)
-    sent_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    external_message_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Empty unless body_encoding is "plain"; read through services.message_codec.message_body.
+    body: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    body_encoding: Mapped[str] = mapped_column(String(16), default="plain")
+    body_payload: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    sent_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    # Message-ID without angle brackets; replies are threaded onto it via In-Reply-To/References.
+    external_message_id: Mapped[str | None] = mapped_column(String(255), nullable=True, unique=True, index=True)
 
     lead: Mapped[Lead] = relationship("Lead", back_populates="emails")
+    template: Mapped[EmailTemplate | None] = relationship("EmailTemplate")
 
 
 class ReplyMessage(Base):
     __tablename__ = "reply_messages"
+    __table_args__ = (Index("ix_reply_messages_received_at_id", "received_at", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     lead_id: Mapped[int] = mapped_column(ForeignKey("leads.id"), index=True)
+    email_message_id: Mapped[int | None] = mapped_column(ForeignKey("email_messages.id"), nullable=True, index=True)
     raw_body: Mapped[str] = mapped_column(Text, nullable=False)
     sentiment: Mapped[Sentiment] = mapped_column(Enum(Sentiment), default=Sentiment.neutral)
     suggested_reply_subject: Mapped[str | None] = mapped_column(String(255), nullable=True)
     suggested_reply_body: Mapped[str | None] = mapped_column(Text, nullable=True)
     suggested_reply_sent: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Pending auto-send time; cleared when sent, edited by hand or superseded by a newer reply.
+    auto_send_due_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
     received_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
 class Alert(Base):
     __tablename__ = "alerts"
+    __table_args__ = (Index("ix_alerts_created_at_id", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     lead_id: Mapped[int | None] = mapped_column(ForeignKey("leads.id"), nullable=True)
@@ -108,3 +149,24 @@ class MailboxUsage(Base):
     sender_email: Mapped[str] = mapped_column(String(255), index=True)
     day: Mapped[str] = mapped_column(String(20), index=True)
     count_sent: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class AlertDailyRollup(Base):
+    __tablename__ = "alert_daily_rollups"
+    __table_args__ = (UniqueConstraint("day", "severity", name="uq_alert_daily_rollups_day_severity"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    day: Mapped[str] = mapped_column(String(20), index=True)
+    severity: Mapped[str] = mapped_column(String(20))
+    count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class MessageArchive(Base):
+    __tablename__ = "message_archive"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    source: Mapped[str] = mapped_column(String(32))
+    source_id: Mapped[int] = mapped_column(Integer)
+    lead_id: Mapped[int] = mapped_column(Integer, index=True)
+    occurred_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, EmailStr
+from datetime import datetime
 
-from app.models.entities import EmailType, Sentiment
+from pydantic import BaseModel, ConfigDict, EmailStr
+
+from app.models.entities import EmailType, LeadStatus, Sentiment
 
 
 class LeadIn(BaseModel):
@@ -13,10 +15,18 @@ class LeadIn(BaseModel):
     niche: str | None = None
 
 
+class ImportRejection(BaseModel):
+    row: int
+    email: str
+    reason: str
+
+
 class LeadImportResult(BaseModel):
     inserted: int
     skipped_existing: int
     skipped_opted_out: int
+    rejected: int = 0
+    errors: list[ImportRejection] = []
 
 
 class DraftEmail(BaseModel):
@@ -28,6 +38,8 @@ class DraftEmail(BaseModel):
 class IncomingReply(BaseModel):
     lead_email: EmailStr
     raw_body: str
+    in_reply_to: str | None = None
+    references: str | None = None
 
 
 class ReplyAnalysis(BaseModel):
@@ -43,3 +55,87 @@ class DashboardMetrics(BaseModel):
     follow_up_due: int
     conversion_rate: float
     templates_total: int
+
+
+class RetentionResult(BaseModel):
+    alerts_rolled_up: int
+    email_messages_archived: int
+    reply_messages_archived: int
+
+
+class LeadOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    email: str
+    company: str | None
+    position: str | None
+    niche: str | None
+    status: LeadStatus
+    created_at: datetime
+    last_contacted_at: datetime | None
+    opt_out: bool
+
+
+class AlertOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    lead_id: int | None
+    severity: str
+    message: str
+    created_at: datetime
+
+
+class ReplyOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    lead_id: int
+    email_message_id: int | None
+    raw_body: str
+    sentiment: Sentiment
+    suggested_reply_subject: str | None
+    suggested_reply_body: str | None
+    suggested_reply_sent: bool
+    received_at: datetime
+
+
+class TemplateStatsOut(BaseModel):
+    template_id: int
+    name: str
+    quality_score: float
+    conversion_score: float
+    sends: int
+    replies: int
+    positive_replies: int
+    neutral_replies: int
+    negative_replies: int
+    opt_outs: int
+    avg_reply_hours: float | None
+
+
+class LeadPage(BaseModel):
+    items: list[LeadOut]
+    next_cursor: str | None
+
+
+class AlertPage(BaseModel):
+    items: list[AlertOut]
+    next_cursor: str | None
+
+
+class ReplyPage(BaseModel):
+    items: list[ReplyOut]
+    next_cursor: str | None
+
+
+class LeadSearchPage(BaseModel):
+    items: list[LeadOut]
+    next_offset: int | None
+
+
+class ReplySearchPage(BaseModel):
+    items: list[ReplyOut]
+    next_offset: int | None
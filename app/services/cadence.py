@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+
+
+def add_business_days(start: datetime, days: int) -> datetime:
+    """Advance ``start`` by ``days`` weekdays, keeping the time of day; weekends are skipped."""
+    current = start
+    remaining = days
+    while remaining > 0:
+        current += timedelta(days=1)
+        if current.weekday() < 5:
+            remaining -= 1
+    return current
+
+
+def next_touch_due(last_contacted_at: datetime, touches_sent: int) -> datetime | None:
+    """When follow-up ``touches_sent + 1`` is due, or None once the cadence is exhausted."""
+    cadence = settings.followup_cadence
+    if touches_sent >= len(cadence):
+        return None
+    return add_business_days(last_contacted_at, cadence[touches_sent])
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from datetime import datetime
+import logging
+import random
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta
 
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
 from app.agents.email_agents import (
@@ -11,25 +16,71 @@ from app.agents.email_agents import (
     OutreachTemplateAgent,
     ReplyAgent,
     TemplateQualityAgent,
+    default_provider,
 )
 from app.agents.model_router import ModelRouter
 from app.core.config import settings
-from app.models.entities import Alert, EmailMessage, EmailTemplate, EmailType, Lead, LeadStatus, MailboxUsage, ReplyMessage
+from app.core.metrics import BATCH_SECONDS, EMAIL_SEND_SECONDS, EMAILS_SENT, QUOTA_REJECTIONS
+from app.models.entities import (
+    Alert,
+    EmailMessage,
+    EmailTemplate,
+    EmailType,
+    Lead,
+    LeadStatus,
+    MailboxUsage,
+    ReplyMessage,
+    Sentiment,
+    TemplateStats,
+)
 from app.models.schemas import DashboardMetrics
-from app.services.email_gateway import EmailGateway
+from app.services.cadence import next_touch_due
+from app.services.email_gateway import EmailGateway, default_email_gateway
+from app.services.email_validation import canonicalize_email
+from app.services.message_codec import encode_body, message_body, store_body
+from app.services.reply_scheduler import reply_auto_sender
 from app.services.template_engine import render_template
+from app.services.template_stats import TemplateStatsService, reply_seconds
+
+logger = logging.getLogger("midas.campaign")
+
+
+def parse_message_ids(header: str | None) -> list[str]:
+    """Message-IDs from an In-Reply-To/References header value, without angle brackets."""
+    if not header:
+        return []
+    bracketed = re.findall(r"<([^<>\s]+)>", header)
+    return bracketed or [token.strip("<>") for token in header.split() if token.strip("<>")]
+
+
+def outreach_context(lead: Lead | Row, tpl: EmailTemplate) -> dict[str, str]:
+    return {
+        "name": lead.name,
+        "company": lead.company or "your company",
+        "niche": lead.niche or "your market",
+        "objective": tpl.objective,
+        "sender_name": "Midas Team",
+        "unsubscribe_link": f"http://127.0.0.1:8000/unsubscribe/{lead.email}",
+    }
 
 
 class CampaignService:
-    def __init__(self, db: Session) -> None:
+    def __init__(
+        self,
+        db: Session,
+        email_gateway: EmailGateway | None = None,
+        provider: ADKProviderAdapter | None = None,
+        rng: random.Random | None = None,
+    ) -> None:
         self.db = db
+        self.template_stats = TemplateStatsService(db, rng)
         router = ModelRouter()
-        provider = ADKProviderAdapter()
+        provider = provider or default_provider()
         self.outreach_agent = OutreachTemplateAgent(router, provider)
         self.quality_agent = TemplateQualityAgent(router, provider)
         self.reply_agent = ReplyAgent(router, provider)
         self.followup_agent = FollowUpAgent(router, provider)
-        self.email_gateway = EmailGateway()
+        self.email_gateway = email_gateway or default_email_gateway()
 
     def seed_templates(self, objective: str, niche: str | None = None) -> int:
         templates = self.outreach_agent.generate_templates(objective, niche)
@@ -50,81 +101,140 @@ class CampaignService:
         self.db.commit()
         return created
 
-    def _mailbox_capacity_ok(self) -> bool:
-        day = datetime.utcnow().strftime("%Y-%m-%d")
-        usage = self.db.scalar(
+    def _mailbox_usage(self, day: str) -> MailboxUsage | None:
+        return self.db.scalar(
             select(MailboxUsage).where(
                 MailboxUsage.sender_email == settings.sender_email,
                 MailboxUsage.day == day,
             )
         )
-        return not usage or usage.count_sent < settings.daily_send_limit_per_mailbox
+
+    def _mailbox_capacity_ok(self) -> bool:
+        usage = self._mailbox_usage(datetime.utcnow().strftime("%Y-%m-%d"))
+        if usage and usage.count_sent >= settings.daily_send_limit_per_mailbox:
+            QUOTA_REJECTIONS.inc()
+            return False
+        return True
+
+    def _send(self, to_email: str, subject: str, body: str, email_type: EmailType) -> str:
+        with EMAIL_SEND_SECONDS.time(email_type=email_type.value):
+            message_id = self.email_gateway.send(to_email, subject, body, settings.sender_email)
+        EMAILS_SENT.inc(email_type=email_type.value)
+        return message_id
 
     def _register_send(self) -> None:
         day = datetime.utcnow().strftime("%Y-%m-%d")
-        usage = self.db.scalar(
-            select(MailboxUsage).where(
-                MailboxUsage.sender_email == settings.sender_email,
-                MailboxUsage.day == day,
-            )
-        )
+        usage = self._mailbox_usage(day)
         if usage is None:
             usage = MailboxUsage(sender_email=settings.sender_email, day=day, count_sent=0)
             self.db.add(usage)
             self.db.flush()
         usage.count_sent += 1
 
+    @BATCH_SECONDS.time(batch="outreach")
     def send_outreach_batch(self, limit: int = 20) -> int:
-        sent = 0
-        leads = self.db.scalars(
-            select(Lead).where(Lead.status == LeadStatus.new, Lead.opt_out.is_(False)).limit(limit)
+        """Send one outreach email per new lead and persist the batch set-wise.
+
+        Gateway calls still happen per lead, but state changes are written as one bulk insert of
+        messages, one UPDATE over the sent leads, one stats UPDATE per template and one quota
+        UPDATE, instead of flushing a dirty ORM object per change. Each lead's template is picked
+        by Thompson sampling over the precomputed ``template_stats``. A gateway error stops the
+        batch, but the emails sent before it are still persisted so they are not sent again.
+        """
+        now = datetime.utcnow()
+        leads = self.db.execute(
+            select(Lead.id, Lead.name, Lead.email, Lead.company, Lead.niche)
+            .where(Lead.status == LeadStatus.new, Lead.opt_out.is_(False))
+            .limit(limit)
         ).all()
-        templates = self.db.scalars(
-            select(EmailTemplate)
+        templates = self.db.execute(
+            select(EmailTemplate, TemplateStats)
+            .outerjoin(TemplateStats, TemplateStats.template_id == EmailTemplate.id)
             .where(EmailTemplate.email_type == EmailType.outreach, EmailTemplate.is_active.is_(True))
-            .order_by(EmailTemplate.usage_count.asc(), EmailTemplate.quality_score.desc())
+            .order_by(EmailTemplate.quality_score.desc(), EmailTemplate.id)
         ).all()
         if not templates:
             return 0
+        day = now.strftime("%Y-%m-%d")
+        usage = self._mailbox_usage(day)
+        remaining = settings.daily_send_limit_per_mailbox - (usage.count_sent if usage else 0)
+        if len(leads) > remaining:
+            leads = leads[: max(remaining, 0)]
+            QUOTA_REJECTIONS.inc()
+            self.db.add(Alert(severity="warning", message="Daily mailbox limit reached"))
+
+        messages: list[dict] = []
+        per_template: dict[int, int] = defaultdict(int)
         for lead in leads:
-            if not self._mailbox_capacity_ok():
-                self.db.add(Alert(severity="warning", message="Daily mailbox limit reached"))
-                break
-            tpl = templates[sent % len(templates)]
-            context = {
-                "name": lead.name,
-                "company": lead.company or "your company",
-                "niche": lead.niche or "your market",
-                "objective": tpl.objective,
-                "sender_name": "Midas Team",
-                "unsubscribe_link": f"http://127.0.0.1:8000/unsubscribe/{lead.email}",
-            }
+            tpl = self.template_stats.choose(templates)
+            context = outreach_context(lead, tpl)
             subject = render_template(tpl.subject_template, context)
             body = render_template(tpl.body_template, context)
-            message_id = self.email_gateway.send(lead.email, subject, body, settings.sender_email)
-            self.db.add(
-                EmailMessage(
-                    lead_id=lead.id,
-                    template_id=tpl.id,
-                    email_type=EmailType.outreach,
-                    subject=subject,
-                    body=body,
-                    external_message_id=message_id,
+            try:
+                message_id = self._send(lead.email, subject, body, EmailType.outreach)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Outreach send to lead_id=%s failed: %s", lead.id, exc)
+                self.db.add(
+                    Alert(lead_id=lead.id, severity="warning", message=f"Outreach send failed: {exc}"[:255])
                 )
+                break
+            encoding, stored_body, payload = encode_body(body, tpl.body_template, context)
+            messages.append(
+                {
+                    "lead_id": lead.id,
+                    "template_id": tpl.id,
+                    "email_type": EmailType.outreach,
+                    "subject": subject,
+                    "body": stored_body,
+                    "body_encoding": encoding,
+                    "body_payload": payload,
+                    "sent_at": now,
+                    "external_message_id": message_id,
+                }
             )
-            tpl.usage_count += 1
-            lead.status = LeadStatus.outreached
-            lead.last_contacted_at = datetime.utcnow()
-            self._register_send()
-            sent += 1
+            per_template[tpl.id] += 1
+
+        if messages:
+            self.db.execute(insert(EmailMessage), messages)
+            self.db.execute(
+                update(Lead)
+                .where(Lead.id.in_([m["lead_id"] for m in messages]))
+                .values(
+                    status=LeadStatus.outreached,
+                    last_contacted_at=now,
+                    touch_count=0,
+                    next_touch_due_at=next_touch_due(now, 0),
+                )
+            )
+            self.template_stats.record_sends(per_template)
+            if usage is None:
+                self.db.add(MailboxUsage(sender_email=settings.sender_email, day=day, count_sent=len(messages)))
+            else:
+                self.db.execute(
+                    update(MailboxUsage)
+                    .where(MailboxUsage.id == usage.id)
+                    .values(count_sent=MailboxUsage.count_sent + len(messages))
+                )
         self.db.commit()
-        return sent
+        return len(messages)
+
+    @BATCH_SECONDS.time(batch="follow_up")
+    def create_followups(self, max_followups: int = 20, now: datetime | None = None) -> int:
+        """Send the next cadence touch to leads whose ``next_touch_due_at`` has passed.
 
-    def create_followups(self, max_followups: int = 20) -> int:
+        Leads are read with a range scan on the due-time index, so a run costs time proportional
+        to the leads that are due; cadence state is then advanced with one UPDATE per touch number.
+        A drafting or gateway error stops the run after recording the touches already sent.
+        """
+        now = now or datetime.utcnow()
         sent = 0
         leads = self.db.scalars(
-            select(Lead).where(Lead.status == LeadStatus.outreached, Lead.opt_out.is_(False)).limit(max_followups)
+            select(Lead)
+            .where(Lead.next_touch_due_at <= now, Lead.opt_out.is_(False))
+            .order_by(Lead.next_touch_due_at)
+            .limit(max_followups)
         ).all()
+        advanced: dict[int, list[int]] = defaultdict(list)
         for lead in leads:
             if not self._mailbox_capacity_ok():
                 break
@@ -134,63 +244,141 @@ class CampaignService:
                 .order_by(EmailMessage.sent_at.desc())
             )
             if not last_outreach:
+                # Nothing to follow up on (e.g. the thread was archived): end the cadence so the
+                # lead stops occupying the front of the due queue on every run.
+                lead.next_touch_due_at = None
                 continue
-            subject_tpl, body_tpl = self.followup_agent.draft(
-                last_outreach.subject,
-                last_outreach.body,
-                objective="pipeline growth",
-                touch_no=1,
-            )
+            touch_no = lead.touch_count + 1
             context = {
                 "name": lead.name,
                 "sender_name": "Midas Team",
                 "unsubscribe_link": f"http://127.0.0.1:8000/unsubscribe/{lead.email}",
             }
-            subject = render_template(subject_tpl, context)
-            body = render_template(body_tpl, context)
-            message_id = self.email_gateway.send(lead.email, subject, body, settings.sender_email)
-            self.db.add(
-                EmailMessage(
-                    lead_id=lead.id,
-                    email_type=EmailType.follow_up,
-                    subject=subject,
-                    body=body,
-                    external_message_id=message_id,
+            try:
+                subject_tpl, body_tpl = self.followup_agent.draft(
+                    last_outreach.subject,
+                    message_body(last_outreach),
+                    objective="pipeline growth",
+                    touch_no=touch_no,
                 )
+                subject = render_template(subject_tpl, context)
+                body = render_template(body_tpl, context)
+                message_id = self._send(lead.email, subject, body, EmailType.follow_up)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Follow-up to lead_id=%s failed: %s", lead.id, exc)
+                self.db.add(Alert(lead_id=lead.id, severity="warning", message=f"Follow-up failed: {exc}"[:255]))
+                break
+            message = EmailMessage(
+                lead_id=lead.id,
+                email_type=EmailType.follow_up,
+                subject=subject,
+                external_message_id=message_id,
             )
-            lead.status = LeadStatus.follow_up_due
+            store_body(message, body)
+            self.db.add(message)
+            advanced[touch_no].append(lead.id)
             self._register_send()
             sent += 1
+        for touch_count, lead_ids in advanced.items():
+            self.db.execute(
+                update(Lead)
+                .where(Lead.id.in_(lead_ids))
+                .values(
+                    status=LeadStatus.follow_up_due,
+                    touch_count=touch_count,
+                    last_contacted_at=now,
+                    next_touch_due_at=next_touch_due(now, touch_count),
+                )
+            )
         self.db.commit()
         return sent
 
-    def process_incoming_reply(self, lead_email: str, raw_body: str) -> None:
-        lead = self.db.scalar(select(Lead).where(Lead.email == lead_email.lower()))
+    def _thread_parent(self, in_reply_to: str | None, references: str | None) -> EmailMessage | None:
+        """Resolve the sent message a reply answers from its threading headers.
+
+        In-Reply-To wins, then References from newest to oldest. All candidates are resolved in
+        one lookup on the unique external_message_id index.
+        """
+        candidates = list(dict.fromkeys(parse_message_ids(in_reply_to) + parse_message_ids(references)[::-1]))
+        if not candidates:
+            return None
+        found = {
+            m.external_message_id: m
+            for m in self.db.scalars(select(EmailMessage).where(EmailMessage.external_message_id.in_(candidates)))
+        }
+        return next((found[c] for c in candidates if c in found), None)
+
+    def _lead_by_address(self, address: str) -> Lead | None:
+        """Find a lead the way imports de-duplicate it: canonical mailbox first, then stored address.
+
+        The fallback covers leads without ``canonical_email`` (rows imported before it existed).
+        """
+        check = canonicalize_email(address)
+        if check.canonical:
+            lead = self.db.scalar(select(Lead).where(Lead.canonical_email == check.canonical))
+            if lead is not None:
+                return lead
+        emails = {(address or "").strip().lower()} | ({check.email} if check.email else set())
+        return self.db.scalar(select(Lead).where(Lead.email.in_(emails)).order_by(Lead.id).limit(1))
+
+    def process_incoming_reply(
+        self,
+        lead_email: str,
+        raw_body: str,
+        in_reply_to: str | None = None,
+        references: str | None = None,
+    ) -> None:
+        parent = self._thread_parent(in_reply_to, references)
+        lead = self._lead_by_address(lead_email)
+        if parent is not None and (lead is None or lead.id != parent.lead_id):
+            # The headers identify the thread even when the reply comes from an alias or forward.
+            lead = self.db.get(Lead, parent.lead_id)
         if not lead:
             self.db.add(Alert(severity="warning", message=f"Reply from unknown sender: {lead_email}"))
             self.db.commit()
             return
 
-        last_email = self.db.scalar(
-            select(EmailMessage).where(EmailMessage.lead_id == lead.id).order_by(EmailMessage.sent_at.desc())
-        )
-        initial_context = last_email.body if last_email else ""
+        last_email = parent
+        if last_email is None:
+            last_email = self.db.scalar(
+                select(EmailMessage).where(EmailMessage.lead_id == lead.id).order_by(EmailMessage.sent_at.desc())
+            )
+        first_reply = self.db.scalar(select(ReplyMessage.id).where(ReplyMessage.lead_id == lead.id).limit(1)) is None
+        initial_context = message_body(last_email) if last_email else ""
         sentiment, subject, body = self.reply_agent.analyze_and_draft(
             raw_body,
             initial_context,
             objective="pipeline growth",
         )
-        self.db.add(
-            ReplyMessage(
-                lead_id=lead.id,
-                raw_body=raw_body,
-                sentiment=sentiment,
-                suggested_reply_subject=subject,
-                suggested_reply_body=body,
+        # A newer reply supersedes any draft still waiting to auto-send.
+        self.db.execute(
+            update(ReplyMessage)
+            .where(
+                ReplyMessage.lead_id == lead.id,
+                ReplyMessage.suggested_reply_sent.is_(False),
+                ReplyMessage.auto_send_due_at.is_not(None),
             )
+            .values(auto_send_due_at=None)
+        )
+        reply = ReplyMessage(
+            lead_id=lead.id,
+            email_message_id=last_email.id if last_email else None,
+            raw_body=raw_body,
+            sentiment=sentiment,
+            suggested_reply_subject=subject,
+            suggested_reply_body=body,
         )
+        if settings.reply_auto_send_enabled and sentiment != Sentiment.negative:
+            reply.auto_send_due_at = datetime.utcnow() + timedelta(minutes=settings.reply_auto_send_delay_minutes)
+        self.db.add(reply)
+        template_id = self.template_stats.thread_template_id(lead.id, last_email)
+        if template_id is not None and first_reply:
+            self.template_stats.record_reply(template_id, sentiment, reply_seconds(last_email, datetime.utcnow()))
         lead.status = LeadStatus.replied
+        lead.next_touch_due_at = None
         if sentiment.value == "negative":
+            if template_id is not None and not lead.opt_out:
+                self.template_stats.record_opt_out(template_id)
             lead.opt_out = True
             lead.status = LeadStatus.opted_out
         self.db.add(
@@ -201,6 +389,50 @@ class CampaignService:
             )
         )
         self.db.commit()
+        if reply.auto_send_due_at is not None:
+            reply_auto_sender.schedule(reply.id, reply.auto_send_due_at)
+
+    def _claim_reply(self, reply_id: int, due_by: datetime | None = None) -> bool:
+        """Mark a pending draft as sent before it goes to the gateway, and commit.
+
+        The conditional UPDATE succeeds for exactly one caller, whether the competitors are the
+        auto-send worker, a manual approval, or a worker in another process. So a draft is never
+        sent twice. With ``due_by``, only a draft whose auto-send time has passed is claimed.
+        """
+        stmt = update(ReplyMessage).where(ReplyMessage.id == reply_id, ReplyMessage.suggested_reply_sent.is_(False))
+        if due_by is not None:
+            stmt = stmt.where(ReplyMessage.auto_send_due_at <= due_by)
+        claimed = self.db.execute(stmt.values(suggested_reply_sent=True, auto_send_due_at=None)).rowcount == 1
+        self.db.commit()
+        return claimed
+
+    def _send_suggested_reply(self, reply: ReplyMessage, lead: Lead, retry_at: datetime | None = None) -> None:
+        """Send a draft already claimed with ``_claim_reply``; a gateway error releases the claim."""
+        try:
+            mid = self._send(
+                lead.email,
+                reply.suggested_reply_subject or "Re: follow up",
+                reply.suggested_reply_body or "",
+                EmailType.reply,
+            )
+        except Exception:
+            self.db.execute(
+                update(ReplyMessage)
+                .where(ReplyMessage.id == reply.id)
+                .values(suggested_reply_sent=False, auto_send_due_at=retry_at)
+            )
+            self.db.commit()
+            raise
+        message = EmailMessage(
+            lead_id=lead.id,
+            email_type=EmailType.reply,
+            subject=reply.suggested_reply_subject or "Re: follow up",
+            external_message_id=mid,
+        )
+        store_body(message, reply.suggested_reply_body or "")
+        self.db.add(message)
+        self._register_send()
+        self.db.commit()
 
     def approve_and_send_suggested_reply(self, lead_id: int) -> bool:
         reply = self.db.scalar(
@@ -209,34 +441,60 @@ class CampaignService:
             .order_by(ReplyMessage.received_at.desc())
         )
         lead = self.db.get(Lead, lead_id)
-        if not reply or not lead:
+        if not reply or not lead or not self._claim_reply(reply.id):
             return False
-        mid = self.email_gateway.send(
-            lead.email,
-            reply.suggested_reply_subject or "Re: follow up",
-            reply.suggested_reply_body or "",
-            settings.sender_email,
-        )
-        self.db.add(
-            EmailMessage(
-                lead_id=lead_id,
-                email_type=EmailType.reply,
-                subject=reply.suggested_reply_subject or "Re: follow up",
-                body=reply.suggested_reply_body or "",
-                external_message_id=mid,
-            )
-        )
-        reply.suggested_reply_sent = True
-        self._register_send()
+        self._send_suggested_reply(reply, lead)
+        return True
+
+    def send_due_reply(self, reply_id: int, now: datetime | None = None) -> bool:
+        """Auto-send one scheduled draft if it is still pending and due.
+
+        The scheduler's queue may hold stale entries (edited, superseded or already sent drafts),
+        so the row is the source of truth and is claimed before sending. A full mailbox or a
+        gateway error pushes the due time back 15 minutes.
+        """
+        now = now or datetime.utcnow()
+        reply = self.db.get(ReplyMessage, reply_id)
+        if reply is None or reply.suggested_reply_sent or reply.auto_send_due_at is None:
+            return False
+        if reply.auto_send_due_at > now:
+            return False
+        lead = self.db.get(Lead, reply.lead_id)
+        if lead is None or lead.opt_out:
+            reply.auto_send_due_at = None
+            self.db.commit()
+            return False
+        if not self._mailbox_capacity_ok():
+            reply.auto_send_due_at = now + timedelta(minutes=15)
+            self.db.commit()
+            return False
+        if not self._claim_reply(reply_id, due_by=now):
+            return False
+        self._send_suggested_reply(reply, lead, retry_at=now + timedelta(minutes=15))
+        return True
+
+    def edit_suggested_reply(self, reply_id: int, subject: str, body: str) -> bool:
+        """Replace a draft by hand; edited drafts leave the auto-send queue and wait for approval."""
+        reply = self.db.get(ReplyMessage, reply_id)
+        if reply is None or reply.suggested_reply_sent:
+            return False
+        reply.suggested_reply_subject = subject
+        reply.suggested_reply_body = body
+        reply.auto_send_due_at = None
         self.db.commit()
         return True
 
     def unsubscribe(self, email: str, reason: str | None = None) -> bool:
-        lead = self.db.scalar(select(Lead).where(Lead.email == email.lower()))
+        lead = self._lead_by_address(email)
         if not lead:
             return False
+        if not lead.opt_out:
+            template_id = self.template_stats.thread_template_id(lead.id, None)
+            if template_id is not None:
+                self.template_stats.record_opt_out(template_id)
         lead.opt_out = True
         lead.status = LeadStatus.opted_out
+        lead.next_touch_due_at = None
         self.db.add(Alert(lead_id=lead.id, severity="info", message=f"Lead unsubscribed. reason={reason or 'n/a'}"))
         self.db.commit()
         return True
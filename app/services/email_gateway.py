@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 import uuid
+from functools import lru_cache
+
+from app.core.config import settings
+from app.core.simulation import SimulationProfile, Simulator, parse_simulation_config
 
 
 class EmailGateway:
@@ -10,3 +14,25 @@ class EmailGateway:
             f"[EMAIL-SEND] sender={sender} to={to_email} subject={subject} message_id={message_id}\n{body}\n"
         )
         return message_id
+
+
+class SimulatedEmailGateway(EmailGateway):
+    """Silent gateway with injected SMTP latency, errors, timeouts and send-rate limits for soak runs."""
+
+    def __init__(self, profile: SimulationProfile) -> None:
+        self.simulator = Simulator(profile)
+
+    def send(self, to_email: str, subject: str, body: str, sender: str) -> str:
+        self.simulator.run()
+        return str(uuid.uuid4())
+
+
+@lru_cache(maxsize=4)
+def _simulated_gateway(raw: str) -> SimulatedEmailGateway | None:
+    profile = parse_simulation_config(raw)["gateway"]
+    return SimulatedEmailGateway(profile) if profile else None
+
+
+def default_email_gateway() -> EmailGateway:
+    # Shared across requests so rate-limit windows span the whole process.
+    return _simulated_gateway(settings.simulation_config_raw) or EmailGateway()
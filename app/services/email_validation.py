@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import re
+import threading
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+
+from email_validator import EmailNotValidError, validate_email
+
+from app.core.config import settings
+
+# RFC 5322 dot-atom local part, ASCII only: non-ASCII local parts are where confusables hide.
+_LOCAL_PART = re.compile(r"^[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+(\.[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+)*$")
+
+DISPOSABLE_DOMAINS = frozenset(
+    {
+        "10minutemail.com",
+        "guerrillamail.com",
+        "guerrillamail.net",
+        "mailinator.com",
+        "maildrop.cc",
+        "sharklasers.com",
+        "temp-mail.org",
+        "tempmail.com",
+        "throwawaymail.com",
+        "trashmail.com",
+        "yopmail.com",
+        "getnada.com",
+        "dispostable.com",
+        "fakeinbox.com",
+    }
+)
+GMAIL_DOMAINS = frozenset({"gmail.com", "googlemail.com"})
+PLUS_ADDRESSING_DOMAINS = GMAIL_DOMAINS | {
+    "outlook.com",
+    "hotmail.com",
+    "live.com",
+    "icloud.com",
+    "me.com",
+    "fastmail.com",
+    "protonmail.com",
+    "proton.me",
+}
+
+
+@dataclass(slots=True)
+class EmailCheck:
+    email: str | None
+    canonical: str | None
+    error: str | None = None
+
+
+def _scripts(label: str) -> set[str]:
+    found = set()
+    for ch in label:
+        if ch.isalpha():
+            found.add(unicodedata.name(ch, "UNKNOWN").split(" ", 1)[0])
+    return found
+
+
+@lru_cache(maxsize=65536)
+def check_domain(domain: str) -> tuple[str | None, str | None]:
+    """Return (ascii_domain, error) for a lowercased domain; cached per process."""
+    for label in domain.split("."):
+        if len(_scripts(label)) > 1:
+            return None, "mixed-script domain label (possible confusable)"
+    try:
+        ascii_domain = validate_email(f"x@{domain}", check_deliverability=False).ascii_domain
+    except EmailNotValidError as exc:
+        return None, str(exc)
+    if ascii_domain in DISPOSABLE_DOMAINS:
+        return None, "disposable email domain"
+    return ascii_domain, None
+
+
+def _split(raw: str) -> tuple[str, str, str | None]:
+    """Normalize one address and return (local, domain, error)."""
+    value = unicodedata.normalize("NFKC", raw or "").strip().lower()
+    if not value:
+        return "", "", "missing email"
+    local, sep, domain = value.rpartition("@")
+    if not sep or not local or not domain:
+        return "", "", "missing @ separator"
+    return local, domain, None
+
+
+def _fold(local: str, domain_check: tuple[str | None, str | None]) -> EmailCheck:
+    if len(local) > 64 or not _LOCAL_PART.match(local):
+        return EmailCheck(None, None, "invalid local part")
+    ascii_domain, error = domain_check
+    if error:
+        return EmailCheck(None, None, error)
+    email = f"{local}@{ascii_domain}"
+    canonical_local, canonical_domain = local, ascii_domain
+    if canonical_domain in PLUS_ADDRESSING_DOMAINS:
+        canonical_local = canonical_local.split("+", 1)[0]
+    if canonical_domain in GMAIL_DOMAINS:
+        canonical_local = canonical_local.replace(".", "")
+        canonical_domain = "gmail.com"
+    if not canonical_local:
+        return EmailCheck(None, None, "invalid local part")
+    return EmailCheck(email, f"{canonical_local}@{canonical_domain}")
+
+
+def canonicalize_email(raw: str) -> EmailCheck:
+    """Validate one address and derive the key used for de-duplication.
+
+    ``email`` is the deliverable form (NFKC, lowercased, ASCII domain); ``canonical`` also folds
+    provider aliases so plus-tags and Gmail dots map to the same mailbox.
+    """
+    local, domain, error = _split(raw)
+    if error:
+        return EmailCheck(None, None, error)
+    return _fold(local, check_domain(domain))
+
+
+def _canonicalize_chunk(emails: list[str]) -> list[tuple[str | None, str | None, str | None]]:
+    # Runs in a pool worker: plain tuples pickle far cheaper than dataclass instances.
+    return [(c.email, c.canonical, c.error) for c in map(canonicalize_email, emails)]
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    # Never fork: the parent may hold engine connections and the auto-sender thread.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _validation_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool, _pool_workers = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()), workers
+        return _pool
+
+
+def shutdown_validation_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+def validate_emails(emails: list[str], workers: int | None = None, chunk_size: int = 5000) -> list[EmailCheck]:
+    """Canonicalize ``emails`` in order.
+
+    Large imports send chunks of raw addresses to a long-lived process pool that runs the whole
+    check there, so each worker keeps its own warm ``check_domain`` cache between imports.
+    """
+    workers = workers or settings.import_validation_workers or os.cpu_count() or 1
+    if workers <= 1 or len(emails) < settings.import_parallel_threshold:
+        return [canonicalize_email(e) for e in emails]
+    chunks = [emails[i : i + chunk_size] for i in range(0, len(emails), chunk_size)]
+    return [EmailCheck(*row) for rows in _validation_pool(workers).map(_canonicalize_chunk, chunks) for row in rows]
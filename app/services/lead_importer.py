@@ -5,11 +5,12 @@ import io
 import json
 from collections.abc import Iterable
 
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
 from app.models.entities import Lead
-from app.models.schemas import LeadImportResult
+from app.models.schemas import ImportRejection, LeadImportResult
+from app.services.email_validation import validate_emails
 
 
 class LeadImporter:
@@ -33,23 +34,55 @@ class LeadImporter:
             return rows
         raise ValueError("Unsupported file type. Use CSV, JSON, or TXT.")
 
+    def _existing(self, emails: set[str], canonicals: set[str]) -> dict[str, bool]:
+        """Map known email/canonical keys to the lead's opt_out flag, a few hundred keys per query."""
+        found: dict[str, bool] = {}
+        keys = sorted(emails | canonicals)
+        for i in range(0, len(keys), 500):
+            chunk = keys[i : i + 500]
+            rows = self.db.execute(
+                select(Lead.email, Lead.canonical_email, Lead.opt_out).where(
+                    or_(Lead.email.in_(chunk), Lead.canonical_email.in_(chunk))
+                )
+            ).all()
+            for email, canonical, opt_out in rows:
+                found[email] = opt_out
+                if canonical:
+                    found[canonical] = opt_out
+        return found
+
     def import_rows(self, rows: Iterable[dict[str, str]]) -> LeadImportResult:
         inserted = skipped_existing = skipped_opted_out = 0
-        for row in rows:
-            email = (row.get("email") or "").strip().lower()
-            name = (row.get("name") or "").strip()
-            if not email or not name:
+        errors: list[ImportRejection] = []
+        candidates = [
+            (idx, row, (row.get("name") or "").strip())
+            for idx, row in enumerate(rows, start=1)
+            if (row.get("email") or "").strip() and (row.get("name") or "").strip()
+        ]
+        checks = validate_emails([row["email"] for _, row, _ in candidates])
+        existing = self._existing(
+            {c.email for c in checks if c.email}, {c.canonical for c in checks if c.canonical}
+        )
+        seen: set[str] = set()
+        for (idx, row, name), check in zip(candidates, checks):
+            if check.error:
+                errors.append(ImportRejection(row=idx, email=row["email"], reason=check.error))
+                continue
+            if check.canonical in seen:
+                skipped_existing += 1
                 continue
-            existing = self.db.scalar(select(Lead).where(Lead.email == email))
-            if existing:
-                if existing.opt_out:
+            seen.add(check.canonical)
+            opt_out = existing.get(check.canonical, existing.get(check.email))
+            if opt_out is not None:
+                if opt_out:
                     skipped_opted_out += 1
                 else:
                     skipped_existing += 1
                 continue
             lead = Lead(
                 name=name,
-                email=email,
+                email=check.email,
+                canonical_email=check.canonical,
                 company=(row.get("company") or "").strip() or None,
                 position=(row.get("position") or "").strip() or None,
                 niche=(row.get("niche") or "").strip() or None,
@@ -61,4 +94,6 @@ class LeadImporter:
             inserted=inserted,
             skipped_existing=skipped_existing,
             skipped_opted_out=skipped_opted_out,
+            rejected=len(errors),
+            errors=errors,
         )
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+import zlib
+
+from app.core.config import settings
+from app.models.entities import EmailMessage
+from app.services.template_engine import render_template
+
+PLAIN = "plain"
+TEMPLATE = "template"
+ZLIB = "zlib"
+
+
+def encode_body(
+    body: str,
+    template_body: str | None = None,
+    context: dict[str, str] | None = None,
+) -> tuple[str, str, bytes | None]:
+    """Return (encoding, body column value, payload) for the most compact exact representation.
+
+    Template mode keeps only the render context and relies on stored templates never being
+    edited in place; it is used only when re-rendering reproduces ``body`` byte for byte.
+    """
+    if settings.message_body_storage != "compact":
+        return PLAIN, body, None
+    if template_body is not None and context is not None and render_template(template_body, context) == body:
+        return TEMPLATE, "", zlib.compress(json.dumps(context, separators=(",", ":")).encode())
+    raw = body.encode()
+    compressed = zlib.compress(raw, 9)
+    if len(compressed) < len(raw):
+        return ZLIB, "", compressed
+    return PLAIN, body, None
+
+
+def store_body(
+    message: EmailMessage,
+    body: str,
+    template_body: str | None = None,
+    context: dict[str, str] | None = None,
+) -> None:
+    message.body_encoding, message.body, message.body_payload = encode_body(body, template_body, context)
+
+
+def decode_body(encoding: str, body: str, payload: bytes | None, template_body: str | None = None) -> str:
+    if encoding == TEMPLATE:
+        if template_body is None:
+            raise ValueError("Template-encoded message body requires its template.")
+        return render_template(template_body, json.loads(zlib.decompress(payload or b"")))
+    if encoding == ZLIB:
+        return zlib.decompress(payload or b"").decode()
+    return body
+
+
+def message_body(message: EmailMessage) -> str:
+    template_body = message.template.body_template if message.body_encoding == TEMPLATE else None
+    return decode_body(message.body_encoding, message.body, message.body_payload, template_body)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    raw = f"{sort_value.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_raw, id_raw = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(sort_raw), int(id_raw)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid pagination cursor.") from exc
+
+
+def keyset_page(
+    db: Session,
+    stmt: Select,
+    sort_col: InstrumentedAttribute,
+    id_col: InstrumentedAttribute,
+    cursor: str | None = None,
+    limit: int = 50,
+) -> tuple[list[Any], str | None]:
+    """Newest-first page of ``stmt`` seeking past ``cursor`` on (sort_col, id_col).
+
+    The predicate is written as ``sort <= x AND (sort < x OR id < y)`` so the leading
+    bound is a plain range on the indexed sort column; page N costs the same as page 1.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        stmt = stmt.where(sort_col <= sort_value, or_(sort_col < sort_value, and_(sort_col == sort_value, id_col < row_id)))
+    rows = db.scalars(stmt.order_by(sort_col.desc(), id_col.desc()).limit(limit + 1)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_col.key), getattr(last, id_col.key))
+    return list(rows), next_cursor
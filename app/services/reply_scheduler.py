@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+from collections.abc import Callable
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.entities import ReplyMessage
+
+logger = logging.getLogger("midas.reply_scheduler")
+
+
+class ReplyAutoSendWorker:
+    """Sends approved reply drafts when their ``auto_send_due_at`` passes.
+
+    Due items live in an in-memory min-heap rebuilt from the indexed column on start, so the
+    worker sleeps until exactly the next due time instead of polling the table. Entries are
+    never removed on cancellation; ``CampaignService.send_due_reply`` re-checks and claims the
+    row before sending, so stale entries and other workers never cause a second send.
+    A periodic rescan picks up deferred drafts and drafts scheduled by other processes.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        rescan_interval_s: float = 60.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.rescan_interval_s = rescan_interval_s
+        self._heap: list[tuple[datetime, int]] = []
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+
+    def rebuild(self) -> int:
+        db = self.session_factory()
+        try:
+            rows = db.execute(
+                select(ReplyMessage.auto_send_due_at, ReplyMessage.id).where(
+                    ReplyMessage.auto_send_due_at.is_not(None),
+                    ReplyMessage.suggested_reply_sent.is_(False),
+                )
+            ).all()
+        finally:
+            db.close()
+        with self._cond:
+            self._heap = [(due, reply_id) for due, reply_id in rows]
+            heapq.heapify(self._heap)
+            self._cond.notify()
+        return len(rows)
+
+    def schedule(self, reply_id: int, due_at: datetime) -> None:
+        with self._cond:
+            heapq.heappush(self._heap, (due_at, reply_id))
+            self._cond.notify()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def _pop_due(self, now: datetime) -> list[int]:
+        with self._cond:
+            due = []
+            while self._heap and self._heap[0][0] <= now:
+                due.append(heapq.heappop(self._heap)[1])
+            return due
+
+    def run_due(self, now: datetime | None = None) -> int:
+        from app.services.campaign_service import CampaignService
+
+        now = now or datetime.utcnow()
+        sent = 0
+        for reply_id in self._pop_due(now):
+            db = self.session_factory()
+            try:
+                sent += CampaignService(db).send_due_reply(reply_id, now)
+            except Exception:  # noqa: BLE001
+                logger.exception("Auto-send failed for reply_id=%s", reply_id)
+                db.rollback()
+            finally:
+                db.close()
+        return sent
+
+    def _loop(self) -> None:
+        last_rescan = datetime.utcnow()
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+                timeout = self.rescan_interval_s
+                if self._heap:
+                    timeout = min(timeout, max(0.0, (self._heap[0][0] - datetime.utcnow()).total_seconds()))
+                self._cond.wait(timeout)
+                if self._stopping:
+                    return
+            if (datetime.utcnow() - last_rescan).total_seconds() >= self.rescan_interval_s:
+                self.rebuild()
+                last_rescan = datetime.utcnow()
+            self.run_due()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self.rebuild()
+        self._thread = threading.Thread(target=self._loop, name="reply-auto-send", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+reply_auto_sender = ReplyAutoSendWorker()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.entities import Alert, AlertDailyRollup, EmailMessage, MessageArchive, ReplyMessage
+from app.models.schemas import RetentionResult
+from app.services.message_codec import message_body
+
+
+class RetentionService:
+    """Keeps hot tables small: rolls old alerts into daily counts and moves cold messages to
+    ``message_archive``. Every batch is its own short transaction so deletes never hold long locks."""
+
+    def __init__(self, db: Session, batch_size: int | None = None) -> None:
+        self.db = db
+        self.batch_size = batch_size or settings.retention_batch_size
+
+    def run(self, now: datetime | None = None) -> RetentionResult:
+        now = now or datetime.utcnow()
+        return RetentionResult(
+            alerts_rolled_up=self.rollup_alerts(now - timedelta(days=settings.alert_retention_days)),
+            email_messages_archived=self.archive_email_messages(now - timedelta(days=settings.message_retention_days)),
+            reply_messages_archived=self.archive_reply_messages(now - timedelta(days=settings.message_retention_days)),
+        )
+
+    def rollup_alerts(self, cutoff: datetime) -> int:
+        total = 0
+        while True:
+            alerts = self.db.scalars(
+                select(Alert).where(Alert.created_at < cutoff).order_by(Alert.id).limit(self.batch_size)
+            ).all()
+            if not alerts:
+                return total
+            counts = Counter((a.created_at.strftime("%Y-%m-%d"), a.severity) for a in alerts)
+            for (day, severity), count in counts.items():
+                rollup = self.db.scalar(
+                    select(AlertDailyRollup).where(AlertDailyRollup.day == day, AlertDailyRollup.severity == severity)
+                )
+                if rollup is None:
+                    rollup = AlertDailyRollup(day=day, severity=severity, count=0)
+                    self.db.add(rollup)
+                rollup.count += count
+            self.db.execute(
+                delete(Alert).where(Alert.id.in_([a.id for a in alerts])).execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            total += len(alerts)
+
+    def archive_email_messages(self, cutoff: datetime) -> int:
+        return self._archive(
+            EmailMessage,
+            EmailMessage.sent_at,
+            cutoff,
+            lambda m: {
+                "template_id": m.template_id,
+                "email_type": m.email_type.value,
+                "subject": m.subject,
+                "body": message_body(m),
+                "sent_at": m.sent_at.isoformat(),
+                "external_message_id": m.external_message_id,
+            },
+            before_delete=self._detach_replies,
+        )
+
+    def _detach_replies(self, message_ids: list[int]) -> None:
+        # Replies can outlive the message they answered; keep them, just drop the thread link.
+        self.db.execute(
+            update(ReplyMessage)
+            .where(ReplyMessage.email_message_id.in_(message_ids))
+            .values(email_message_id=None)
+            .execution_options(synchronize_session=False)
+        )
+
+    def archive_reply_messages(self, cutoff: datetime) -> int:
+        return self._archive(
+            ReplyMessage,
+            ReplyMessage.received_at,
+            cutoff,
+            lambda r: {
+                "email_message_id": r.email_message_id,
+                "raw_body": r.raw_body,
+                "sentiment": r.sentiment.value,
+                "suggested_reply_subject": r.suggested_reply_subject,
+                "suggested_reply_body": r.suggested_reply_body,
+                "suggested_reply_sent": r.suggested_reply_sent,
+                "received_at": r.received_at.isoformat(),
+            },
+        )
+
+    def _archive(self, model, time_col, cutoff: datetime, to_payload, before_delete=None) -> int:  # noqa: ANN001
+        total = 0
+        while True:
+            rows = self.db.scalars(
+                select(model).where(time_col < cutoff).order_by(model.id).limit(self.batch_size)
+            ).all()
+            if not rows:
+                return total
+            for row in rows:
+                self.db.add(
+                    MessageArchive(
+                        source=model.__tablename__,
+                        source_id=row.id,
+                        lead_id=row.lead_id,
+                        occurred_at=getattr(row, time_col.key),
+                        payload=zlib.compress(json.dumps(to_payload(row)).encode()),
+                    )
+                )
+            self.db.flush()
+            if before_delete is not None:
+                before_delete([r.id for r in rows])
+            self.db.execute(
+                delete(model).where(model.id.in_([r.id for r in rows])).execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            total += len(rows)
+
+    def archived_messages(self, lead_id: int) -> list[dict[str, Any]]:
+        rows = self.db.scalars(
+            select(MessageArchive).where(MessageArchive.lead_id == lead_id).order_by(MessageArchive.occurred_at)
+        ).all()
+        return [
+            {"source": row.source, "source_id": row.source_id, **json.loads(zlib.decompress(row.payload))}
+            for row in rows
+        ]
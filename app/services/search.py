@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import re
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.models.entities import Lead, ReplyMessage
+
+MAX_RESULTS = 100
+_PG_TEXT_CONFIG = {"leads": "simple", "reply_messages": "english"}
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def fts5_query(raw: str) -> str | None:
+    """Turn free text into a safe FTS5 query: every word must match, last one as a prefix."""
+    tokens = _TOKEN.findall(raw)
+    if not tokens:
+        return None
+    quoted = [f'"{t}"' for t in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+class SearchService:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    @property
+    def _dialect(self) -> str:
+        return self.db.get_bind().dialect.name
+
+    def _ranked_ids(self, table: str, raw: str, limit: int, offset: int) -> list[int]:
+        limit = max(1, min(limit, MAX_RESULTS))
+        params = {"limit": limit, "offset": max(offset, 0)}
+        if self._dialect == "postgresql":
+            params["q"] = raw
+            tsquery = f"websearch_to_tsquery('{_PG_TEXT_CONFIG[table]}', :q)"
+            sql = (
+                f"SELECT id FROM {table} WHERE search_vector @@ {tsquery} "
+                f"ORDER BY ts_rank(search_vector, {tsquery}) DESC, id DESC LIMIT :limit OFFSET :offset"
+            )
+        else:
+            query = fts5_query(raw)
+            if query is None:
+                return []
+            params["q"] = query
+            sql = f"SELECT rowid FROM {table}_fts WHERE {table}_fts MATCH :q ORDER BY rank LIMIT :limit OFFSET :offset"
+        return [row[0] for row in self.db.execute(text(sql), params)]
+
+    def _load(self, model, ids: list[int]) -> list:  # noqa: ANN001
+        if not ids:
+            return []
+        by_id = {row.id: row for row in self.db.scalars(select(model).where(model.id.in_(ids)))}
+        return [by_id[i] for i in ids if i in by_id]
+
+    def search_leads(self, q: str, limit: int = 20, offset: int = 0) -> list[Lead]:
+        return self._load(Lead, self._ranked_ids("leads", q, limit, offset))
+
+    def search_replies(self, q: str, limit: int = 20, offset: int = 0) -> list[ReplyMessage]:
+        return self._load(ReplyMessage, self._ranked_ids("reply_messages", q, limit, offset))
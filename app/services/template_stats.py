@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.entities import EmailMessage, EmailTemplate, EmailType, Sentiment, TemplateStats
+
+_SENTIMENT_COLUMN = {
+    Sentiment.positive: TemplateStats.positive_replies,
+    Sentiment.neutral: TemplateStats.neutral_replies,
+    Sentiment.negative: TemplateStats.negative_replies,
+}
+
+
+def conversions(stats: TemplateStats | None) -> tuple[int, int]:
+    """(non-negative replies, sends) for a template; a missing row means nothing sent yet."""
+    if stats is None:
+        return 0, 0
+    return (stats.positive_replies or 0) + (stats.neutral_replies or 0), stats.sends or 0
+
+
+def conversion_score_expr(template_id: int):  # noqa: ANN201
+    """Non-negative reply rate read from ``template_stats``, for writing into ``EmailTemplate``."""
+    rate = (TemplateStats.positive_replies + TemplateStats.neutral_replies) * 1.0 / func.nullif(TemplateStats.sends, 0)
+    return func.coalesce(select(rate).where(TemplateStats.template_id == template_id).scalar_subquery(), 0.0)
+
+
+class TemplateStatsService:
+    """Maintains ``template_stats`` incrementally and picks templates from it.
+
+    Every counter change is an upsert that adds to the stored value (``ON CONFLICT DO UPDATE``
+    on SQLite and PostgreSQL), so concurrent writers neither lose increments nor collide
+    creating a template's first row, and nothing ever rescans message history.
+    """
+
+    def __init__(self, db: Session, rng: random.Random | None = None) -> None:
+        self.db = db
+        self.rng = rng or random.Random()
+
+    def choose(self, candidates: Sequence[tuple[EmailTemplate, TemplateStats | None]]) -> EmailTemplate:
+        """Thompson sampling: draw each template's reply rate from Beta(1 + replies, 1 + misses)
+        and use the best draw. Unproven templates keep getting traffic until the data rules them out."""
+        best, best_draw = None, -1.0
+        for template, stats in candidates:
+            replies, sends = conversions(stats)
+            draw = self.rng.betavariate(1 + replies, 1 + max(sends - replies, 0))
+            if draw > best_draw:
+                best, best_draw = template, draw
+        return best
+
+    def record_sends(self, counts: dict[int, int]) -> None:
+        for template_id, count in counts.items():
+            self._bump(template_id, sends=count)
+            self._refresh_score(template_id, usage_count=EmailTemplate.usage_count + count)
+
+    def record_reply(self, template_id: int, sentiment: Sentiment, reply_seconds: float) -> None:
+        column = _SENTIMENT_COLUMN[sentiment]
+        self._bump(template_id, replies=1, reply_seconds_total=max(reply_seconds, 0.0), **{column.key: 1})
+        self._refresh_score(template_id)
+
+    def record_opt_out(self, template_id: int) -> None:
+        self._bump(template_id, opt_outs=1)
+
+    def thread_template_id(self, lead_id: int, message: EmailMessage | None) -> int | None:
+        """The outreach template that opened the lead's thread."""
+        if message is not None and message.template_id is not None:
+            return message.template_id
+        return self.db.scalar(
+            select(EmailMessage.template_id)
+            .where(
+                EmailMessage.lead_id == lead_id,
+                EmailMessage.email_type == EmailType.outreach,
+                EmailMessage.template_id.is_not(None),
+            )
+            .order_by(EmailMessage.sent_at.desc())
+            .limit(1)
+        )
+
+    def best(self, limit: int = 10) -> list[dict]:
+        rows = self.db.execute(
+            select(EmailTemplate, TemplateStats)
+            .join(TemplateStats, TemplateStats.template_id == EmailTemplate.id)
+            .order_by(EmailTemplate.conversion_score.desc(), TemplateStats.sends.desc())
+            .limit(limit)
+        ).all()
+        return [
+            {
+                "template_id": template.id,
+                "name": template.name,
+                "quality_score": template.quality_score,
+                "conversion_score": template.conversion_score,
+                "sends": stats.sends,
+                "replies": stats.replies,
+                "positive_replies": stats.positive_replies,
+                "neutral_replies": stats.neutral_replies,
+                "negative_replies": stats.negative_replies,
+                "opt_outs": stats.opt_outs,
+                "avg_reply_hours": (
+                    round(stats.reply_seconds_total / stats.replies / 3600, 2) if stats.replies else None
+                ),
+            }
+            for template, stats in rows
+        ]
+
+    def _bump(self, template_id: int, **deltas: float) -> None:
+        dialect = {"sqlite": sqlite, "postgresql": postgresql}.get(self.db.get_bind().dialect.name)
+        if dialect is not None:
+            stmt = dialect.insert(TemplateStats).values(template_id=template_id, **deltas)
+            self.db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[TemplateStats.template_id],
+                    set_={key: getattr(TemplateStats, key) + getattr(stmt.excluded, key) for key in deltas},
+                )
+            )
+            return
+        values = {key: getattr(TemplateStats, key) + delta for key, delta in deltas.items()}
+        updated = self.db.execute(
+            update(TemplateStats)
+            .where(TemplateStats.template_id == template_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not updated:
+            self.db.execute(insert(TemplateStats).values(template_id=template_id, **deltas))
+
+    def _refresh_score(self, template_id: int, **extra) -> None:  # noqa: ANN003
+        self.db.execute(
+            update(EmailTemplate)
+            .where(EmailTemplate.id == template_id)
+            .values(conversion_score=conversion_score_expr(template_id), **extra)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def reply_seconds(message: EmailMessage | None, received_at: datetime) -> float:
+    return (received_at - message.sent_at).total_seconds() if message is not None and message.sent_at else 0.0
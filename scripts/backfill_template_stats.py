@@ -0,0 +1,83 @@
+"""Rebuild template_stats and EmailTemplate.conversion_score from message history.
+
+Run once after upgrading a database created before the stats table, or to repair drift. The
+running service keeps the table current incrementally, so this is the only full history scan.
+
+Usage: python scripts/backfill_template_stats.py
+"""
+
+from collections import defaultdict
+
+from sqlalchemy import delete, insert, select, update
+
+from app.db.session import get_session, init_db
+from app.models.entities import EmailMessage, EmailTemplate, EmailType, Lead, ReplyMessage, Sentiment, TemplateStats
+from app.services.template_stats import conversion_score_expr
+
+SENTIMENT_KEY = {
+    Sentiment.positive: "positive_replies",
+    Sentiment.neutral: "neutral_replies",
+    Sentiment.negative: "negative_replies",
+}
+
+
+def main() -> None:
+    init_db()
+    db = get_session()
+    stats: dict[int, dict] = defaultdict(lambda: defaultdict(float))
+    thread: dict[int, tuple[int, object]] = {}
+    sent_at: dict[int, object] = {}
+    rows = db.execute(
+        select(EmailMessage.id, EmailMessage.lead_id, EmailMessage.template_id, EmailMessage.email_type, EmailMessage.sent_at)
+        .order_by(EmailMessage.sent_at, EmailMessage.id)
+        .execution_options(yield_per=5000)
+    )
+    for message_id, lead_id, template_id, email_type, at in rows:
+        sent_at[message_id] = at
+        if email_type == EmailType.outreach and template_id is not None:
+            stats[template_id]["sends"] += 1
+            thread[lead_id] = (template_id, at)
+
+    seen: set[int] = set()
+    replies = db.execute(
+        select(ReplyMessage.lead_id, ReplyMessage.email_message_id, ReplyMessage.sentiment, ReplyMessage.received_at)
+        .order_by(ReplyMessage.received_at, ReplyMessage.id)
+        .execution_options(yield_per=5000)
+    )
+    for lead_id, parent_id, sentiment, received_at in replies:
+        if lead_id in seen or lead_id not in thread:
+            continue
+        seen.add(lead_id)
+        template_id, outreach_at = thread[lead_id]
+        answered_at = sent_at.get(parent_id, outreach_at)
+        row = stats[template_id]
+        row["replies"] += 1
+        row[SENTIMENT_KEY[sentiment]] += 1
+        row["reply_seconds_total"] += max((received_at - answered_at).total_seconds(), 0.0)
+
+    for (lead_id,) in db.execute(select(Lead.id).where(Lead.opt_out.is_(True))):
+        if lead_id in thread:
+            stats[thread[lead_id][0]]["opt_outs"] += 1
+
+    db.execute(delete(TemplateStats))
+    if stats:
+        db.execute(
+            insert(TemplateStats),
+            [
+                {"template_id": template_id, **{k: (v if k == "reply_seconds_total" else int(v)) for k, v in row.items()}}
+                for template_id, row in stats.items()
+            ],
+        )
+    for (template_id,) in db.execute(select(EmailTemplate.id)).all():
+        db.execute(
+            update(EmailTemplate)
+            .where(EmailTemplate.id == template_id)
+            .values(conversion_score=conversion_score_expr(template_id))
+        )
+    db.commit()
+    db.close()
+    print(f"Rebuilt stats for {len(stats)} templates")
+
+
+if __name__ == "__main__":
+    main()
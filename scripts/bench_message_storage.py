@@ -0,0 +1,80 @@
+"""Bytes per stored EmailMessage and body read latency, plain vs compact storage.
+
+Usage: python scripts/bench_message_storage.py [--messages 20000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.session import Base
+from app.models.entities import EmailMessage, EmailTemplate, EmailType, Lead
+from app.services.campaign_service import CampaignService, outreach_context
+from app.services.message_codec import message_body, store_body
+from app.services.template_engine import render_template
+
+
+def _run(mode: str, messages: int, tmp: str) -> None:
+    settings.message_body_storage = mode
+    path = Path(tmp) / f"{mode}.db"
+    engine = create_engine(f"sqlite:///{path}", future=True)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+    CampaignService(db).seed_templates("book discovery calls", "SaaS")
+    templates = db.scalars(select(EmailTemplate)).all()
+
+    for i in range(messages):
+        lead = Lead(name=f"Lead {i}", email=f"lead{i}@example.com", company=f"Company {i}", niche="SaaS")
+        db.add(lead)
+        db.flush()
+        tpl = templates[i % len(templates)]
+        context = outreach_context(lead, tpl)
+        body = render_template(tpl.body_template, context)
+        message = EmailMessage(
+            lead_id=lead.id,
+            template_id=tpl.id,
+            email_type=EmailType.outreach,
+            subject=render_template(tpl.subject_template, context),
+        )
+        store_body(message, body, tpl.body_template, context)
+        db.add(message)
+        if i % 1000 == 999:
+            db.commit()
+    db.commit()
+
+    stored = db.scalar(
+        select(func.sum(func.length(EmailMessage.body) + func.coalesce(func.length(EmailMessage.body_payload), 0)))
+    )
+    db.close()
+
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+    t0 = time.perf_counter()
+    for message in db.scalars(select(EmailMessage).limit(5000)):
+        message_body(message)
+    read_us = (time.perf_counter() - t0) / min(messages, 5000) * 1e6
+    db.close()
+    engine.dispose()
+    db_bytes = os.path.getsize(path)
+    print(
+        f"{mode:>8} body_bytes/msg={stored / messages:8.1f} "
+        f"db_bytes/msg={db_bytes / messages:8.1f} read_us/msg={read_us:7.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=20_000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("plain", "compact"):
+            _run(mode, args.messages, tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Compare keyset vs OFFSET pagination latency by page depth on a synthetic leads table.
+
+Usage: python scripts/bench_pagination.py [--rows 1000000] [--page-size 50]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.models.entities import Lead
+from app.services.pagination import encode_cursor, keyset_page
+
+
+def _seed(db, rows: int) -> None:
+    start = datetime(2024, 1, 1)
+    chunk = 20_000
+    for offset in range(0, rows, chunk):
+        db.execute(
+            insert(Lead),
+            [
+                {
+                    "name": f"Lead {i}",
+                    "email": f"lead{i}@example.com",
+                    "company": f"Company {i % 500}",
+                    "niche": f"niche-{i % 20}",
+                    "created_at": start + timedelta(seconds=i // 3),
+                }
+                for i in range(offset, min(offset + chunk, rows))
+            ],
+        )
+    db.commit()
+
+
+def _time(fn, repeat: int = 5) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", future=True)
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine, expire_on_commit=False)()
+        _seed(db, args.rows)
+
+        print(f"rows={args.rows} page_size={args.page_size}")
+        print(f"{'page':>10} {'keyset_ms':>10} {'offset_ms':>10}")
+        max_page = args.rows // args.page_size
+        for page in (1, 10, 100, 1_000, 10_000):
+            if page > max_page:
+                break
+            offset = (page - 1) * args.page_size
+            cursor = None
+            if offset:
+                anchor = db.scalars(
+                    select(Lead).order_by(Lead.created_at.desc(), Lead.id.desc()).offset(offset - 1).limit(1)
+                ).one()
+                cursor = encode_cursor(anchor.created_at, anchor.id)
+
+            keyset_ms = _time(lambda: keyset_page(db, select(Lead), Lead.created_at, Lead.id, cursor, args.page_size))
+            offset_ms = _time(
+                lambda: db.scalars(
+                    select(Lead)
+                    .order_by(Lead.created_at.desc(), Lead.id.desc())
+                    .offset(offset)
+                    .limit(args.page_size)
+                ).all()
+            )
+            print(f"{page:>10} {keyset_ms:>10.2f} {offset_ms:>10.2f}")
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
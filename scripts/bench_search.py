@@ -0,0 +1,107 @@
+"""Ranked full-text search latency vs the full LIKE scan it replaces, on synthetic leads/replies.
+
+Usage: python scripts/bench_search.py [--rows 1000000]
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, insert, or_, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.search_index import ensure_search_index
+from app.db.session import Base
+from app.models.entities import Lead, ReplyMessage, Sentiment
+from app.services.search import SearchService
+
+WORDS = ["acme", "globex", "initech", "umbrella", "hooli", "stark", "wayne", "wonka", "cyberdyne", "soylent"]
+ROLES = ["Head of Growth", "VP Sales", "CTO", "Founder", "Marketing Lead", "Data Engineer"]
+NICHES = ["SaaS", "Fintech", "DevTools", "Retail", "Healthcare", "Logistics"]
+
+
+def _seed(db, rows: int) -> None:  # noqa: ANN001
+    rng = random.Random(7)
+    chunk = 20_000
+    for offset in range(0, rows, chunk):
+        ids = range(offset, min(offset + chunk, rows))
+        db.execute(
+            insert(Lead),
+            [
+                {
+                    "id": i + 1,
+                    "name": f"Lead {i}",
+                    "email": f"lead{i}@example.com",
+                    "company": f"{rng.choice(WORDS).title()} {i % 1000}",
+                    "position": rng.choice(ROLES),
+                    "niche": rng.choice(NICHES),
+                }
+                for i in ids
+            ],
+        )
+        db.execute(
+            insert(ReplyMessage),
+            [
+                {
+                    "lead_id": i + 1,
+                    "raw_body": f"Thanks, we already work with {rng.choice(WORDS)} on this. Ticket {i}.",
+                    "sentiment": Sentiment.neutral,
+                }
+                for i in ids
+                if i % 10 == 0
+            ],
+        )
+        db.commit()
+
+
+def _time(fn, repeat: int = 5) -> float:  # noqa: ANN001
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'search.db'}", future=True)
+        Base.metadata.create_all(engine)
+        ensure_search_index(engine)
+        db = sessionmaker(bind=engine, expire_on_commit=False)()
+        _seed(db, args.rows)
+        search = SearchService(db)
+
+        print(f"rows={args.rows}")
+        print(f"{'query':<28} {'fts_ms':>8} {'like_scan_ms':>13}")
+        for term in ("wonka", "cto fintech", "stark 42"):
+            fts = _time(lambda: search.search_leads(term, limit=20))
+            pattern = f"%{term.split()[0]}%"
+            like = _time(
+                lambda: db.scalar(
+                    select(func.count())
+                    .select_from(Lead)
+                    .where(or_(Lead.company.ilike(pattern), Lead.position.ilike(pattern), Lead.niche.ilike(pattern)))
+                )
+            )
+            print(f"leads: {term:<21} {fts:>8.2f} {like:>13.2f}")
+        fts = _time(lambda: search.search_replies("cyberdyne", limit=20))
+        like = _time(
+            lambda: db.scalar(
+                select(func.count()).select_from(ReplyMessage).where(ReplyMessage.raw_body.ilike("%cyberdyne%"))
+            )
+        )
+        print(f"replies: {'cyberdyne':<19} {fts:>8.2f} {like:>13.2f}")
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
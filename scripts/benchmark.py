@@ -0,0 +1,279 @@
+"""Synthetic-data benchmarks for the core service paths.
+
+Seeds a throwaway SQLite database per dataset size (leads, outreach messages and replies),
+then times the importer, parsers, campaign batches, reply processing, metrics and template
+rendering with a silent gateway and an instant provider so only Midas code is measured.
+
+Usage:
+    python scripts/benchmark.py --sizes 10000,100000,1000000 --output bench.json
+    python scripts/benchmark.py --sizes 10000 --compare bench.json --output bench-new.json --threshold 0.2
+"""
+
+import argparse
+import csv
+import io
+import json
+import platform
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.metrics import install_query_hooks, track_queries
+from app.db.session import Base
+from app.models.entities import EmailMessage, EmailTemplate, EmailType, Lead, LeadStatus, ReplyMessage, Sentiment
+from app.services.campaign_service import CampaignService
+from app.services.lead_importer import LeadImporter
+from app.services.template_engine import render_template
+
+SEED = 1337
+
+
+class SilentEmailGateway:
+    def send(self, to_email: str, subject: str, body: str, sender: str) -> str:
+        return str(uuid.uuid4())
+
+
+class InstantProvider:
+    def call(self, target, req) -> str:  # noqa: ANN001
+        return "ok"
+
+
+def _lead_row(i: int) -> dict[str, str]:
+    return {
+        "name": f"Lead {i}",
+        "email": f"lead{i}@bench{i % 997}.example.com",
+        "company": f"Company {i % 5000}",
+        "position": "Head of Growth",
+        "niche": f"niche-{i % 40}",
+    }
+
+
+def _seed(db, size: int) -> CampaignService:  # noqa: ANN001
+    service = CampaignService(db, email_gateway=SilentEmailGateway(), provider=InstantProvider())
+    service.seed_templates("book discovery calls", "SaaS")
+    template = db.scalars(select(EmailTemplate)).first()
+    start = datetime.utcnow() - timedelta(days=30)
+    chunk = 20_000
+    for offset in range(0, size, chunk):
+        ids = range(offset, min(offset + chunk, size))
+        leads, messages, replies = [], [], []
+        for i in ids:
+            bucket = i % 10
+            status = LeadStatus.new if bucket < 6 else LeadStatus.outreached if bucket < 9 else LeadStatus.replied
+            contacted = start + timedelta(seconds=i, minutes=5) if status != LeadStatus.new else None
+            leads.append(
+                {
+                    "id": i + 1,
+                    **_lead_row(i),
+                    "status": status,
+                    "created_at": start + timedelta(seconds=i),
+                    "last_contacted_at": contacted,
+                    "next_touch_due_at": contacted + timedelta(days=2) if status == LeadStatus.outreached else None,
+                }
+            )
+            if status != LeadStatus.new:
+                messages.append(
+                    {
+                        "lead_id": i + 1,
+                        "template_id": template.id,
+                        "email_type": EmailType.outreach,
+                        "subject": "Quick idea",
+                        "body": template.body_template,
+                        "sent_at": start + timedelta(seconds=i, minutes=5),
+                        "external_message_id": str(uuid.UUID(int=i)),
+                    }
+                )
+            if status == LeadStatus.replied:
+                replies.append(
+                    {"lead_id": i + 1, "raw_body": "Sounds good, let's talk.", "sentiment": Sentiment.positive}
+                )
+        db.execute(insert(Lead), leads)
+        if messages:
+            db.execute(insert(EmailMessage), messages)
+        if replies:
+            db.execute(insert(ReplyMessage), replies)
+        db.commit()
+    return service
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _measure(fn: Callable[[], int], repeat: int) -> dict[str, Any]:
+    """Run ``fn`` ``repeat`` times (each call returns the ops it performed), then once more
+    under tracemalloc for peak memory so allocation tracing doesn't skew the timings."""
+    latencies: list[float] = []
+    ops = 0
+    with track_queries() as queries:
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            ops += fn()
+            latencies.append((time.perf_counter() - start) * 1000)
+        elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "calls": repeat,
+        "ops": ops,
+        "throughput_ops_per_s": round(ops / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(statistics.median(latencies), 3),
+            "p95": round(_percentile(latencies, 95), 3),
+            "p99": round(_percentile(latencies, 99), 3),
+            "max": round(max(latencies), 3),
+        },
+        "queries_per_call": round(queries.count / repeat, 2),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def _payloads(rows: list[dict[str, str]]) -> dict[str, bytes]:
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    return {
+        "leads.csv": out.getvalue().encode(),
+        "leads.json": json.dumps(rows).encode(),
+        "leads.txt": "\n".join(f"{r['name']},{r['email']}" for r in rows).encode(),
+    }
+
+
+def run_size(size: int, repeat: int, tmp: str) -> dict[str, Any]:
+    rng = random.Random(SEED)
+    engine = create_engine(f"sqlite:///{Path(tmp) / f'bench_{size}.db'}", future=True)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    service = _seed(db, size)
+    importer = LeadImporter(db)
+    results: dict[str, Any] = {}
+
+    next_import = iter(range(size, size + 10_000_000, 1000))
+
+    def import_chunk() -> int:
+        first = next(next_import)
+        rows = [_lead_row(i) for i in range(first, first + 1000)]
+        rows += [_lead_row(rng.randrange(size)) for _ in range(100)]
+        importer.import_rows(rows)
+        return len(rows)
+
+    results["import_rows"] = _measure(import_chunk, repeat)
+
+    parse_rows = [_lead_row(i) for i in range(min(size, 10_000))]
+    for filename, payload in _payloads(parse_rows).items():
+        results[f"parse_{filename.rsplit('.', 1)[1]}"] = _measure(
+            lambda f=filename, p=payload: len(importer.parse(f, p)), repeat
+        )
+
+    results["send_outreach_batch"] = _measure(lambda: service.send_outreach_batch(limit=100), repeat)
+    results["create_followups"] = _measure(lambda: service.create_followups(max_followups=100), repeat)
+
+    replied_pool = list(range(6, size, 10))
+
+    def reply() -> int:
+        idx = rng.choice(replied_pool)
+        service.process_incoming_reply(_lead_row(idx)["email"], "Yes, interested. Can we schedule a call?")
+        return 1
+
+    results["process_incoming_reply"] = _measure(reply, repeat)
+    results["metrics"] = _measure(lambda: (service.metrics(), 1)[1], repeat)
+
+    tpl = db.scalars(select(EmailTemplate)).first()
+    context = {"name": "Ada", "company": "Acme", "niche": "SaaS", "objective": "demos", "sender_name": "Midas Team",
+               "unsubscribe_link": "http://127.0.0.1:8000/unsubscribe/ada@acme.com"}
+
+    def render() -> int:
+        for _ in range(1000):
+            render_template(tpl.body_template, context)
+        return 1000
+
+    results["render_template"] = _measure(render, repeat)
+    db.close()
+    engine.dispose()
+    return results
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    regressions = []
+    for size, cases in current["results"].items():
+        for case, stats in cases.items():
+            base = baseline.get("results", {}).get(size, {}).get(case)
+            if not base:
+                continue
+            if stats["throughput_ops_per_s"] < base["throughput_ops_per_s"] * (1 - threshold):
+                regressions.append(
+                    f"{size}/{case}: throughput {base['throughput_ops_per_s']} -> {stats['throughput_ops_per_s']} ops/s"
+                )
+            if stats["latency_ms"]["p95"] > base["latency_ms"]["p95"] * (1 + threshold):
+                regressions.append(f"{size}/{case}: p95 {base['latency_ms']['p95']} -> {stats['latency_ms']['p95']} ms")
+            if stats["queries_per_call"] > base["queries_per_call"]:
+                regressions.append(
+                    f"{size}/{case}: queries/call {base['queries_per_call']} -> {stats['queries_per_call']}"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", default="bench.json")
+    parser.add_argument("--compare", help="baseline JSON written by a previous run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown")
+    args = parser.parse_args()
+    baseline = None
+    if args.compare:
+        # Read up front: never compare against a file this run is about to overwrite.
+        if Path(args.compare).resolve() == Path(args.output).resolve():
+            parser.error("--output must differ from --compare, or the baseline is overwritten")
+        baseline = json.loads(Path(args.compare).read_text())
+
+    install_query_hooks()
+    settings.daily_send_limit_per_mailbox = 10**9
+    report: dict[str, Any] = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (int(s) for s in args.sizes.split(",")):
+            print(f"benchmarking {size} leads...")
+            report["results"][str(size)] = run_size(size, args.repeat, tmp)
+            for case, stats in report["results"][str(size)].items():
+                print(
+                    f"  {case:<24} {stats['throughput_ops_per_s']:>12} ops/s  p95={stats['latency_ms']['p95']}ms"
+                    f"  q/call={stats['queries_per_call']}  peak={stats['peak_memory_kb']}KB"
+                )
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"wrote {args.output}")
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
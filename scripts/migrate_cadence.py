@@ -0,0 +1,47 @@
+"""Add follow-up cadence columns to databases created before them and schedule in-flight leads.
+
+Leads still waiting for their first follow-up get touch 1 scheduled from last_contacted_at;
+leads that already received the single follow-up the old flow sent continue at touch 2.
+
+Usage: python scripts/migrate_cadence.py
+"""
+
+from sqlalchemy import inspect, select, text
+
+from app.db.session import engine, get_session, init_db
+from app.models.entities import Lead, LeadStatus
+from app.services.cadence import next_touch_due
+
+
+def main() -> None:
+    init_db()
+    columns = {c["name"] for c in inspect(engine).get_columns("leads")}
+    with engine.begin() as conn:
+        if "touch_count" not in columns:
+            conn.execute(text("ALTER TABLE leads ADD COLUMN touch_count INTEGER DEFAULT 0"))
+        if "next_touch_due_at" not in columns:
+            conn.execute(text("ALTER TABLE leads ADD COLUMN next_touch_due_at DATETIME"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_leads_next_touch_due_at ON leads (next_touch_due_at)"))
+
+    db = get_session()
+    scheduled = 0
+    for touches, status in ((0, LeadStatus.outreached), (1, LeadStatus.follow_up_due)):
+        leads = db.scalars(
+            select(Lead).where(
+                Lead.status == status,
+                Lead.opt_out.is_(False),
+                Lead.next_touch_due_at.is_(None),
+                Lead.last_contacted_at.is_not(None),
+            )
+        )
+        for lead in leads:
+            lead.touch_count = touches
+            lead.next_touch_due_at = next_touch_due(lead.last_contacted_at, touches)
+            scheduled += 1
+    db.commit()
+    db.close()
+    print(f"Scheduled {scheduled} leads")
+
+
+if __name__ == "__main__":
+    main()
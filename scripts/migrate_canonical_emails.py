@@ -0,0 +1,69 @@
+"""Add leads.canonical_email to databases created before it and backfill it from email.
+
+Run this before the other migration scripts: every ORM query over ``Lead`` selects the column.
+Existing leads are canonicalized in id order; when several old leads fold to the same mailbox
+(e.g. ``ann+x@gmail.com`` and ``ann@gmail.com``) only the oldest keeps the key, and addresses
+that no longer validate keep NULL and are still matched on ``email``.
+
+Usage: python scripts/migrate_canonical_emails.py [--batch-size 1000]
+"""
+
+import argparse
+
+from sqlalchemy import bindparam, inspect, select, text, update
+
+from app.db.session import engine, init_db
+from app.models.entities import Lead
+from app.services.email_validation import canonicalize_email
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    init_db()
+    columns = {c["name"] for c in inspect(engine).get_columns("leads")}
+    with engine.begin() as conn:
+        if "canonical_email" not in columns:
+            conn.execute(text("ALTER TABLE leads ADD COLUMN canonical_email VARCHAR(255)"))
+        conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_leads_canonical_email ON leads (canonical_email)"))
+
+    leads = Lead.__table__
+    last_id = filled = conflicts = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(leads.c.id, leads.c.email)
+                .where(leads.c.id > last_id, leads.c.canonical_email.is_(None))
+                .order_by(leads.c.id)
+                .limit(args.batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            wanted: dict[str, int] = {}
+            for lead_id, email in rows:
+                canonical = canonicalize_email(email).canonical
+                if canonical is None:
+                    continue
+                if canonical in wanted:
+                    conflicts += 1
+                    continue
+                wanted[canonical] = lead_id
+            taken = set(
+                conn.scalars(select(leads.c.canonical_email).where(leads.c.canonical_email.in_(list(wanted))))
+            )
+            conflicts += len(taken)
+            params = [{"lead_id": i, "canonical": c} for c, i in wanted.items() if c not in taken]
+            if params:
+                conn.execute(
+                    update(leads).where(leads.c.id == bindparam("lead_id")).values(canonical_email=bindparam("canonical")),
+                    params,
+                )
+            filled += len(params)
+    print(f"Backfilled {filled} canonical emails ({conflicts} aliases of an older lead left NULL)")
+
+
+if __name__ == "__main__":
+    main()
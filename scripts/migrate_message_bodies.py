@@ -0,0 +1,88 @@
+"""Convert stored EmailMessage bodies to compact storage.
+
+Adds the body_encoding/body_payload columns to databases created before they existed,
+then re-encodes plain rows in id-ordered batches. Outreach rows whose body re-renders
+exactly from their template become context-only; everything else is zlib-compressed.
+
+Usage: python scripts/migrate_message_bodies.py [--batch-size 500]
+"""
+
+import argparse
+
+from sqlalchemy import bindparam, inspect, select, text, update
+
+from app.db.session import engine, init_db
+from app.models.entities import EmailMessage, EmailTemplate, EmailType, Lead
+from app.services.campaign_service import outreach_context
+from app.services.message_codec import PLAIN, encode_body
+
+MESSAGES = EmailMessage.__table__
+TEMPLATES = EmailTemplate.__table__
+LEADS = Lead.__table__
+
+
+def _add_missing_columns() -> None:
+    columns = {c["name"] for c in inspect(engine).get_columns("email_messages")}
+    with engine.begin() as conn:
+        if "body_encoding" not in columns:
+            conn.execute(text("ALTER TABLE email_messages ADD COLUMN body_encoding VARCHAR(16) DEFAULT 'plain'"))
+        if "body_payload" not in columns:
+            conn.execute(text("ALTER TABLE email_messages ADD COLUMN body_payload BLOB"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    init_db()
+    _add_missing_columns()
+    # Core selects of just the columns needed, so columns added to these tables later
+    # (and not yet migrated) can't break this script.
+    query = (
+        select(
+            MESSAGES.c.id,
+            MESSAGES.c.email_type,
+            MESSAGES.c.body,
+            TEMPLATES.c.body_template,
+            TEMPLATES.c.objective,
+            LEADS.c.name,
+            LEADS.c.email,
+            LEADS.c.company,
+            LEADS.c.niche,
+        )
+        .outerjoin(TEMPLATES, TEMPLATES.c.id == MESSAGES.c.template_id)
+        .join(LEADS, LEADS.c.id == MESSAGES.c.lead_id)
+        .where(MESSAGES.c.body_encoding == PLAIN)
+        .order_by(MESSAGES.c.id)
+        .limit(args.batch_size)
+    )
+    store = (
+        update(MESSAGES)
+        .where(MESSAGES.c.id == bindparam("message_id"))
+        .values(body_encoding=bindparam("encoding"), body=bindparam("stored_body"), body_payload=bindparam("payload"))
+    )
+    last_id = converted = 0
+    while True:
+        with engine.begin() as conn:
+            batch = conn.execute(query.where(MESSAGES.c.id > last_id)).all()
+            if not batch:
+                break
+            params = []
+            for row in batch:
+                if row.email_type == EmailType.outreach and row.body_template is not None:
+                    # The row carries both the lead and template fields outreach_context reads.
+                    encoded = encode_body(row.body, row.body_template, outreach_context(row, row))
+                else:
+                    encoded = encode_body(row.body)
+                if encoded[0] != PLAIN:
+                    params.append(dict(zip(("encoding", "stored_body", "payload"), encoded), message_id=row.id))
+            if params:
+                conn.execute(store, params)
+            converted += len(params)
+            last_id = batch[-1].id
+    print(f"Converted {converted} message bodies")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""Create the keyset-pagination indexes on databases created before them.
+
+``create_all`` only creates missing tables, so existing leads/alerts/reply_messages tables
+never get the composite ``(created_at, id)`` and filter indexes the JSON list endpoints use.
+
+Usage: python scripts/migrate_pagination_indexes.py
+"""
+
+from sqlalchemy import text
+
+from app.db.session import engine, init_db
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_leads_created_at_id ON leads (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_leads_status_created_at_id ON leads (status, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_leads_niche_created_at_id ON leads (niche, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_leads_company_created_at_id ON leads (company, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_alerts_created_at_id ON alerts (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_reply_messages_received_at_id ON reply_messages (received_at, id)",
+]
+
+
+def main() -> None:
+    init_db()
+    with engine.begin() as conn:
+        for statement in INDEXES:
+            conn.execute(text(statement))
+    print(f"Ensured {len(INDEXES)} pagination indexes")
+
+
+if __name__ == "__main__":
+    main()
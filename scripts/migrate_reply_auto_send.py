@@ -0,0 +1,27 @@
+"""Add the reply auto-send column to databases created before it.
+
+Adds reply_messages.auto_send_due_at and its index, which the auto-send worker rebuilds its
+queue from. Existing drafts are left unscheduled and still wait for manual approval.
+
+Usage: python scripts/migrate_reply_auto_send.py
+"""
+
+from sqlalchemy import inspect, text
+
+from app.db.session import engine, init_db
+
+
+def main() -> None:
+    init_db()
+    columns = {c["name"] for c in inspect(engine).get_columns("reply_messages")}
+    with engine.begin() as conn:
+        if "auto_send_due_at" not in columns:
+            conn.execute(text("ALTER TABLE reply_messages ADD COLUMN auto_send_due_at DATETIME"))
+        conn.execute(
+            text("CREATE INDEX IF NOT EXISTS ix_reply_messages_auto_send_due_at ON reply_messages (auto_send_due_at)")
+        )
+    print("Ensured reply auto-send column")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""Create the index retention scans on databases created before it.
+
+Archival range-scans ``email_messages.sent_at``; ``create_all`` creates the new rollup and
+archive tables but never adds indexes to the existing ``email_messages`` table.
+
+Usage: python scripts/migrate_retention.py
+"""
+
+from sqlalchemy import text
+
+from app.db.session import engine, init_db
+
+
+def main() -> None:
+    init_db()
+    with engine.begin() as conn:
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_email_messages_sent_at ON email_messages (sent_at)"))
+    print("Ensured retention indexes")
+
+
+if __name__ == "__main__":
+    main()
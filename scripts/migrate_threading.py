@@ -0,0 +1,44 @@
+"""Add reply threading to databases created before it.
+
+Adds reply_messages.email_message_id and the unique index on email_messages.external_message_id
+that In-Reply-To/References lookups use. Existing replies are linked to the latest message sent
+to their lead before they arrived, which is what the old heuristic assumed.
+
+Usage: python scripts/migrate_threading.py
+"""
+
+from sqlalchemy import inspect, text
+
+from app.db.session import engine, init_db
+
+
+def main() -> None:
+    init_db()
+    columns = {c["name"] for c in inspect(engine).get_columns("reply_messages")}
+    with engine.begin() as conn:
+        if "email_message_id" not in columns:
+            conn.execute(
+                text("ALTER TABLE reply_messages ADD COLUMN email_message_id INTEGER REFERENCES email_messages (id)")
+            )
+        conn.execute(
+            text("CREATE INDEX IF NOT EXISTS ix_reply_messages_email_message_id ON reply_messages (email_message_id)")
+        )
+        conn.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ix_email_messages_external_message_id "
+                "ON email_messages (external_message_id)"
+            )
+        )
+        linked = conn.execute(
+            text(
+                "UPDATE reply_messages SET email_message_id = ("
+                "SELECT m.id FROM email_messages m WHERE m.lead_id = reply_messages.lead_id "
+                "AND m.sent_at <= reply_messages.received_at ORDER BY m.sent_at DESC, m.id DESC LIMIT 1) "
+                "WHERE email_message_id IS NULL"
+            )
+        ).rowcount
+    print(f"Linked {linked} replies")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""Apply alert rollup and message archival retention policies; intended for a daily cron."""
+
+from app.db.session import get_session, init_db
+from app.services.retention import RetentionService
+
+
+def main() -> None:
+    init_db()
+    db = get_session()
+    result = RetentionService(db).run()
+    db.close()
+    print(result.model_dump_json())
+
+
+if __name__ == "__main__":
+    main()
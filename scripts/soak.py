@@ -0,0 +1,187 @@
+"""Open-loop load generator that drives the Midas HTTP API for long soak runs.
+
+Start the server with simulated backends, e.g.
+
+    MIDAS_SIMULATION='{"provider": {"latency_median_ms": 400, "error_rate": 0.05, "rate_limit": 60,
+                       "seed": 7}, "gateway": {"latency_median_ms": 150, "timeout_rate": 0.01,
+                       "timeout_ms": 5000, "seed": 7}}' uvicorn app.main:app
+
+then run
+
+    python scripts/soak.py --base-url http://127.0.0.1:8000 --rate 20 --duration 3600
+
+Requests are issued on a fixed schedule regardless of response time (so slow responses show
+up as tail latency rather than reduced load) and mixed across import, outreach, reply
+webhook and dashboard traffic. A summary with throughput, error budget use and latency
+percentiles per endpoint is printed every --report-every seconds and at the end.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+import httpx
+
+
+@dataclass
+class EndpointStats:
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    error_kinds: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+
+def _pct(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class Soak:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.stats: dict[str, EndpointStats] = defaultdict(EndpointStats)
+        self.known_emails: list[str] = []
+        self.import_seq = 0
+        self.run_id = f"{int(time.time())}"
+        self.mix = [
+            ("import", args.mix_import),
+            ("send_outreach", args.mix_outreach),
+            ("reply_webhook", args.mix_reply),
+            ("dashboard", args.mix_dashboard),
+        ]
+
+    def _pick(self) -> str:
+        total = sum(weight for _, weight in self.mix)
+        roll = self.rng.uniform(0, total)
+        for name, weight in self.mix:
+            roll -= weight
+            if roll <= 0:
+                return name
+        return self.mix[-1][0]
+
+    def _import_payload(self) -> tuple[str, bytes]:
+        rows = ["name,email,company,niche"]
+        for _ in range(self.args.import_size):
+            self.import_seq += 1
+            email = f"soak-{self.run_id}-{self.import_seq}@example.com"
+            self.known_emails.append(email)
+            rows.append(f"Soak Lead {self.import_seq},{email},Company {self.import_seq % 97},SaaS")
+        return "soak.csv", "\n".join(rows).encode()
+
+    async def _request(self, client: httpx.AsyncClient, kind: str) -> None:
+        if kind == "reply_webhook" and not self.known_emails:
+            kind = "import"
+        start = time.perf_counter()
+        try:
+            if kind == "import":
+                filename, payload = self._import_payload()
+                resp = await client.post("/leads/import", files={"file": (filename, payload, "text/csv")})
+            elif kind == "send_outreach":
+                resp = await client.post("/campaign/send-outreach")
+            elif kind == "reply_webhook":
+                body = self.rng.choice(
+                    ["Yes, interested - can we schedule?", "Maybe next quarter.", "Not interested, remove me."]
+                )
+                resp = await client.post(
+                    "/inbox/reply", json={"lead_email": self.rng.choice(self.known_emails), "raw_body": body}
+                )
+            else:
+                resp = await client.get("/")
+            error = f"http_{resp.status_code}" if resp.status_code >= 400 else None
+        except httpx.HTTPError as exc:
+            error = type(exc).__name__
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        stats = self.stats[kind]
+        stats.latencies_ms.append(elapsed_ms)
+        if error:
+            stats.errors += 1
+            stats.error_kinds[error] += 1
+
+    def report(self, elapsed_s: float) -> dict:
+        endpoints = {}
+        total = errors = 0
+        for kind, stats in sorted(self.stats.items()):
+            count = len(stats.latencies_ms)
+            total += count
+            errors += stats.errors
+            endpoints[kind] = {
+                "requests": count,
+                "errors": stats.errors,
+                "error_kinds": dict(stats.error_kinds),
+                "p50_ms": round(statistics.median(stats.latencies_ms), 1) if count else 0.0,
+                "p95_ms": round(_pct(stats.latencies_ms, 95), 1),
+                "p99_ms": round(_pct(stats.latencies_ms, 99), 1),
+                "p999_ms": round(_pct(stats.latencies_ms, 99.9), 1),
+                "max_ms": round(max(stats.latencies_ms), 1) if count else 0.0,
+            }
+        error_rate = errors / total if total else 0.0
+        return {
+            "elapsed_s": round(elapsed_s, 1),
+            "requests": total,
+            "throughput_rps": round(total / elapsed_s, 2) if elapsed_s else 0.0,
+            "error_rate": round(error_rate, 5),
+            "error_budget_used": round(error_rate / self.args.slo_error_rate, 3) if self.args.slo_error_rate else None,
+            "endpoints": endpoints,
+        }
+
+    async def run(self) -> dict:
+        limits = httpx.Limits(max_connections=self.args.concurrency)
+        timeout = httpx.Timeout(self.args.timeout)
+        async with httpx.AsyncClient(base_url=self.args.base_url, limits=limits, timeout=timeout) as client:
+            if self.args.seed_templates:
+                await client.post("/templates/generate", data={"objective": "soak testing", "niche": "SaaS"})
+            in_flight: set[asyncio.Task] = set()
+            interval = 1.0 / self.args.rate
+            start = time.perf_counter()
+            next_report = start + self.args.report_every
+            next_fire = start
+            while (now := time.perf_counter()) - start < self.args.duration:
+                if now < next_fire:
+                    await asyncio.sleep(next_fire - now)
+                next_fire += interval
+                task = asyncio.create_task(self._request(client, self._pick()))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+                if time.perf_counter() >= next_report:
+                    print(json.dumps(self.report(time.perf_counter() - start)), flush=True)
+                    next_report += self.args.report_every
+            if in_flight:
+                await asyncio.wait(in_flight)
+            return self.report(time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rate", type=float, default=10.0, help="target requests per second")
+    parser.add_argument("--duration", type=float, default=300.0, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--import-size", type=int, default=50, help="leads per import request")
+    parser.add_argument("--mix-import", type=float, default=0.05)
+    parser.add_argument("--mix-outreach", type=float, default=0.10)
+    parser.add_argument("--mix-reply", type=float, default=0.45)
+    parser.add_argument("--mix-dashboard", type=float, default=0.40)
+    parser.add_argument("--slo-error-rate", type=float, default=0.01, help="error budget as a fraction")
+    parser.add_argument("--report-every", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--seed-templates", action="store_true", help="generate templates before the run")
+    parser.add_argument("--output", help="write the final report JSON here")
+    args = parser.parse_args()
+
+    final = asyncio.run(Soak(args).run())
+    print(json.dumps(final, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(final, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+
+
+from app.core.config import settings
+from app.models.entities import Lead, LeadStatus
+from app.services.cadence import add_business_days, next_touch_due
+from app.services.campaign_service import CampaignService
+from app.services.lead_importer import LeadImporter
+
+
+def test_add_business_days_skips_weekends():
+    friday = datetime(2024, 5, 3, 9, 30)
+    assert add_business_days(friday, 1) == datetime(2024, 5, 6, 9, 30)
+    assert add_business_days(friday, 5) == datetime(2024, 5, 10, 9, 30)
+
+
+def test_next_touch_due_stops_after_last_touch(monkeypatch):
+    monkeypatch.setattr(settings, "followup_cadence", [2, 3])
+    monday = datetime(2024, 5, 6)
+    assert next_touch_due(monday, 0) == datetime(2024, 5, 8)
+    assert next_touch_due(monday, 1) == datetime(2024, 5, 9)
+    assert next_touch_due(monday, 2) is None
+
+
+def test_followups_follow_the_cadence_and_stop_on_reply(db, monkeypatch):
+    monkeypatch.setattr(settings, "followup_cadence", [2, 3, 4])
+    LeadImporter(db).import_rows(
+        [{"name": "A", "email": "a@org.com"}, {"name": "B", "email": "b@org.com"}]
+    )
+    service = CampaignService(db)
+    service.seed_templates("book calls", "SaaS")
+    service.send_outreach_batch(limit=2)
+
+    now = datetime.utcnow()
+    assert service.create_followups(now=now) == 0
+
+    first_due = now + timedelta(days=5)
+    assert service.create_followups(now=first_due) == 2
+    lead_a = db.query(Lead).filter(Lead.email == "a@org.com").one()
+    assert lead_a.touch_count == 1
+    assert lead_a.status == LeadStatus.follow_up_due
+    assert lead_a.next_touch_due_at == add_business_days(first_due, 3)
+
+    service.process_incoming_reply("b@org.com", "Maybe later")
+    assert service.create_followups(now=first_due + timedelta(days=7)) == 1
+    assert db.query(Lead).filter(Lead.email == "b@org.com").one().touch_count == 1
+
+
+def test_leads_without_messages_leave_the_due_queue(db):
+    LeadImporter(db).import_rows([{"name": f"L{i}", "email": f"l{i}@org.com"} for i in range(3)])
+    service = CampaignService(db)
+    service.seed_templates("book calls", "SaaS")
+    service.send_outreach_batch(limit=2)
+    orphan = db.query(Lead).filter(Lead.email == "l2@org.com").one()
+    orphan.next_touch_due_at = datetime.utcnow() - timedelta(days=30)
+    db.commit()
+
+    now = datetime.utcnow() + timedelta(days=30)
+    assert service.create_followups(max_followups=1, now=now) == 0
+    assert orphan.next_touch_due_at is None
+    assert service.create_followups(max_followups=1, now=now) == 1
@@ -1,13 +1,39 @@
+import uuid
+from datetime import datetime, timedelta
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
-from app.models.entities import Lead, LeadStatus
+from app.models.entities import EmailMessage, EmailTemplate, EmailType, Lead, LeadStatus, MailboxUsage, ReplyMessage
 from app.db.session import Base
 from app.services.campaign_service import CampaignService
 from app.services.lead_importer import LeadImporter
 
 
+class FlakyGateway:
+    def __init__(self, fail_on: int) -> None:
+        self.calls = 0
+        self.fail_on = fail_on
+
+    def send(self, to_email: str, subject: str, body: str, sender: str) -> str:
+        self.calls += 1
+        if self.calls == self.fail_on:
+            raise TimeoutError("smtp timeout")
+        return str(uuid.uuid4())
+
+
+class FlakyProvider:
+    def __init__(self, ok_calls: int) -> None:
+        self.ok_calls = ok_calls
+
+    def call(self, target, req) -> str:  # noqa: ANN001
+        if self.ok_calls <= 0:
+            raise RuntimeError("provider unavailable")
+        self.ok_calls -= 1
+        return "ok"
+
+
 def _db():
     engine = create_engine("sqlite:///:memory:", future=True)
     Base.metadata.create_all(engine)
@@ -46,6 +72,23 @@ def test_unsubscribe():
     assert ok is True
 
 
+def test_inbound_addresses_match_leads_by_canonical_mailbox():
+    db = _db()
+    LeadImporter(db).import_rows(
+        [{"name": "Ann", "email": "ann@bücher.de"}, {"name": "Jane", "email": "jane.doe@gmail.com"}]
+    )
+    service = CampaignService(db)
+    service.seed_templates("book calls", "SaaS")
+    service.send_outreach_batch(limit=2)
+
+    service.process_incoming_reply("ann@bücher.de", "Yes, interested.")
+    service.process_incoming_reply("jane.doe+promo@gmail.com", "Maybe, tell me more.")
+
+    assert db.query(ReplyMessage).count() == 2
+    assert service.unsubscribe("ANN@Bücher.de", "Not relevant") is True
+    assert db.query(Lead).filter(Lead.email == "ann@xn--bcher-kva.de").one().opt_out is True
+
+
 def test_negative_reply_marks_lead_opted_out():
     db = _db()
     importer = LeadImporter(db)
@@ -83,3 +126,93 @@ def test_send_batch_respects_daily_mailbox_limit_on_first_usage_day():
         settings.daily_send_limit_per_mailbox = original_limit
 
     assert sent == 2
+
+
+def test_send_batch_persists_state_set_wise():
+    db = _db()
+    importer = LeadImporter(db)
+    importer.import_rows([{"name": f"L{i}", "email": f"l{i}@org.com"} for i in range(8)])
+    service = CampaignService(db)
+    service.seed_templates("book calls", "SaaS")
+
+    assert service.send_outreach_batch(limit=8) == 8
+
+    assert db.query(Lead).filter(Lead.status == LeadStatus.outreached).count() == 8
+    assert all(lead.next_touch_due_at is not None for lead in db.query(Lead).all())
+    assert sum(t.usage_count for t in db.query(EmailTemplate).all()) == 8
+    assert db.query(EmailMessage).count() == 8
+    assert db.query(MailboxUsage).one().count_sent == 8
+
+
+def test_reply_threads_onto_message_named_in_headers():
+    db = _db()
+    importer = LeadImporter(db)
+    importer.import_rows([{"name": "Tom", "email": "tom@org.com"}])
+    service = CampaignService(db)
+    service.seed_templates("book calls", "SaaS")
+    service.send_outreach_batch(limit=1)
+
+    lead = db.query(Lead).one()
+    first = db.query(EmailMessage).one()
+    later = EmailMessage(
+        lead_id=lead.id, email_type=EmailType.follow_up, subject="Bump", body="Bump", external_message_id="later@x"
+    )
+    db.add(later)
+    db.commit()
+
+    service.process_incoming_reply(
+        "tom.alias@other.com",
+        "Sounds interesting, tell me more.",
+        in_reply_to=f"<{first.external_message_id}>",
+        references=f"<unknown@x> <{first.external_message_id}>",
+    )
+
+    reply = db.query(ReplyMessage).one()
+    assert reply.lead_id == lead.id
+    assert reply.email_message_id == first.id
+
+
+def test_send_batch_records_emails_sent_before_a_gateway_error():
+    db = _db()
+    importer = LeadImporter(db)
+    importer.import_rows([{"name": f"L{i}", "email": f"l{i}@org.com"} for i in range(4)])
+    service = CampaignService(db, email_gateway=FlakyGateway(fail_on=3))
+    service.seed_templates("book calls", "SaaS")
+
+    assert service.send_outreach_batch(limit=4) == 2
+
+    assert db.query(Lead).filter(Lead.status == LeadStatus.outreached).count() == 2
+    assert db.query(EmailMessage).count() == 2
+    assert db.query(MailboxUsage).one().count_sent == 2
+    assert service.send_outreach_batch(limit=4) == 2
+    assert db.query(EmailMessage).count() == 4
+
+
+def test_followups_record_touches_sent_before_a_gateway_error():
+    db = _db()
+    importer = LeadImporter(db)
+    importer.import_rows([{"name": f"L{i}", "email": f"l{i}@org.com"} for i in range(3)])
+    service = CampaignService(db)
+    service.seed_templates("book calls", "SaaS")
+    service.send_outreach_batch(limit=3)
+
+    service.email_gateway = FlakyGateway(fail_on=2)
+    assert service.create_followups(now=datetime.utcnow() + timedelta(days=30)) == 1
+
+    assert db.query(Lead).filter(Lead.touch_count == 1).count() == 1
+    assert db.query(EmailMessage).filter(EmailMessage.email_type == EmailType.follow_up).count() == 1
+
+
+def test_followups_record_touches_drafted_before_a_provider_outage():
+    db = _db()
+    importer = LeadImporter(db)
+    importer.import_rows([{"name": f"L{i}", "email": f"l{i}@org.com"} for i in range(3)])
+    service = CampaignService(db)
+    service.seed_templates("book calls", "SaaS")
+    service.send_outreach_batch(limit=3)
+
+    service.followup_agent.provider = FlakyProvider(ok_calls=1)
+    assert service.create_followups(now=datetime.utcnow() + timedelta(days=30)) == 1
+
+    assert db.query(Lead).filter(Lead.touch_count == 1).count() == 1
+    assert db.query(EmailMessage).filter(EmailMessage.email_type == EmailType.follow_up).count() == 1
@@ -0,0 +1,44 @@
+import sqlite3
+
+from sqlalchemy import create_engine
+
+from app.db.data_version import DataVersion, data_version
+from app.services.lead_importer import LeadImporter
+
+
+def test_dashboard_etag_returns_304_until_data_changes(client, session_factory):
+    first = client.get("/")
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+
+    cached = client.get("/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+    version = data_version.current
+    LeadImporter(session_factory()).import_rows([{"name": "Zed", "email": "zed@org.com"}])
+    assert data_version.current == version + 1
+
+    fresh = client.get("/", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"] != etag
+    assert "zed@org.com" in fresh.text
+
+
+def test_etag_changes_when_another_process_commits_to_the_sqlite_file(tmp_path):
+    path = tmp_path / "midas.db"
+    # A separate connection stands in for run_retention.py or a migration script.
+    other = sqlite3.connect(path)
+    other.execute("CREATE TABLE alerts (id INTEGER PRIMARY KEY)")
+    other.commit()
+
+    version = DataVersion()
+    version.watch(create_engine(f"sqlite:///{path}"))
+    before = version.etag("dashboard")
+    assert version.etag("dashboard") == before
+
+    other.execute("INSERT INTO alerts DEFAULT VALUES")
+    other.commit()
+    other.close()
+
+    assert version.current == 0
+    assert version.etag("dashboard") != before
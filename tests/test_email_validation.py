@@ -0,0 +1,41 @@
+
+from app.core.config import settings
+from app.services.email_validation import canonicalize_email, validate_emails
+from app.services.lead_importer import LeadImporter
+
+
+def test_canonicalize_folds_provider_aliases_and_rejects_bad_input():
+    assert canonicalize_email(" J.Doe+news@GoogleMail.com ").canonical == "jdoe@gmail.com"
+    assert canonicalize_email("j.doe+news@GoogleMail.com").email == "j.doe+news@googlemail.com"
+    assert canonicalize_email("sam+crm@acme.io").canonical == "sam+crm@acme.io"
+    assert canonicalize_email("ann@bücher.de").email == "ann@xn--bcher-kva.de"
+
+    assert canonicalize_email("not-an-email").error
+    assert canonicalize_email("bob@mailinator.com").error == "disposable email domain"
+    assert canonicalize_email("bоb@acme.com").error == "invalid local part"
+    assert "confusable" in canonicalize_email("bob@pаypal.com").error
+
+
+def test_parallel_validation_matches_serial(monkeypatch):
+    emails = [f"user{i}+tag@gmail.com" if i % 3 else f"bad{i}@" for i in range(60)]
+    monkeypatch.setattr(settings, "import_parallel_threshold", 10)
+    parallel = validate_emails(emails, workers=2, chunk_size=16)
+    serial = validate_emails(emails, workers=1)
+    assert parallel == serial
+
+
+def test_import_dedupes_aliases_and_reports_rejects(db):
+    importer = LeadImporter(db)
+    importer.import_rows([{"name": "Jane", "email": "jane.doe@gmail.com"}])
+
+    result = importer.import_rows(
+        [
+            {"name": "Jane", "email": "JaneDoe+promo@gmail.com"},
+            {"name": "Ray", "email": "ray@acme.com"},
+            {"name": "Ray again", "email": "RAY@acme.com"},
+            {"name": "Spam", "email": "x@yopmail.com"},
+        ]
+    )
+
+    assert (result.inserted, result.skipped_existing, result.rejected) == (1, 2, 1)
+    assert result.errors[0].row == 4
@@ -0,0 +1,29 @@
+from sqlalchemy import select
+
+from app.models.entities import EmailMessage, EmailType
+from app.services.campaign_service import CampaignService
+from app.services.lead_importer import LeadImporter
+from app.services.message_codec import PLAIN, TEMPLATE, ZLIB, encode_body, message_body
+
+
+def test_outreach_bodies_are_stored_as_template_context_and_render_exactly(db):
+    LeadImporter(db).import_rows([{"name": "Alice", "email": "alice@acme.com", "company": "Acme"}])
+    service = CampaignService(db)
+    service.seed_templates("get demos", "SaaS")
+    service.send_outreach_batch(limit=1)
+
+    message = db.scalar(select(EmailMessage).where(EmailMessage.email_type == EmailType.outreach))
+    assert message.body_encoding == TEMPLATE
+    assert message.body == ""
+    rendered = message_body(message)
+    assert rendered.startswith("Hi Alice,")
+    assert "Acme" in rendered
+
+
+def test_encode_body_falls_back_to_zlib_or_plain():
+    long_body = "Thanks for your reply. " * 40
+    encoding, body, payload = encode_body(long_body, "Hi {{name}}", {"name": "Bob"})
+    assert encoding == ZLIB and body == "" and payload
+
+    encoding, body, payload = encode_body("ok")
+    assert (encoding, body, payload) == (PLAIN, "ok", None)
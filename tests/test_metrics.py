@@ -0,0 +1,48 @@
+from sqlalchemy import create_engine, text
+
+from app.agents.model_router import GenerationRequest, ModelRouter
+from app.core.config import ModelTarget
+from app.core.metrics import LLM_FAILOVERS, LLM_FAILURES, Counter, Histogram, install_query_hooks, track_queries
+
+
+def test_histogram_and_counter_render_prometheus_text():
+    hist = Histogram("demo_seconds", "Demo.", ("route",), buckets=(0.1, 1.0))
+    hist.observe(0.05, route="/")
+    hist.observe(0.5, route="/")
+    counter = Counter("demo_total", "Demo.")
+
+    lines = hist.render() + counter.render()
+
+    assert 'demo_seconds_bucket{route="/",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{route="/",le="+Inf"} 2' in lines
+    assert 'demo_seconds_count{route="/"} 2' in lines
+    assert "demo_total 0.0" in lines
+
+
+def test_router_records_failures_and_failovers():
+    router = ModelRouter(
+        [
+            ModelTarget(provider="p", model="bad", api_key="fail-key", priority=1),
+            ModelTarget(provider="p", model="good", api_key="ok", priority=2),
+        ]
+    )
+    failovers = LLM_FAILOVERS.value()
+    failures = LLM_FAILURES.value(target="p:bad")
+
+    def call(target, req):
+        if "fail" in target.api_key:
+            raise RuntimeError("boom")
+        return "ok"
+
+    assert router.generate(GenerationRequest("hi"), call) == "ok"
+    assert LLM_FAILOVERS.value() == failovers + 1
+    assert LLM_FAILURES.value(target="p:bad") == failures + 1
+
+
+def test_query_hooks_count_statements_in_scope():
+    install_query_hooks()
+    engine = create_engine("sqlite:///:memory:", future=True)
+    with engine.connect() as conn, track_queries() as stats:
+        conn.execute(text("select 1"))
+        conn.execute(text("select 2"))
+    assert stats.count == 2
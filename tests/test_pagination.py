@@ -0,0 +1,37 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from app.models.entities import Lead, LeadStatus
+from app.services.pagination import keyset_page
+
+
+def test_keyset_pages_cover_all_rows_with_tied_timestamps(db):
+    same_time = datetime(2024, 5, 1, 12, 0)
+    for i in range(7):
+        db.add(Lead(name=f"L{i}", email=f"l{i}@org.com", created_at=same_time))
+    db.commit()
+
+    seen: list[int] = []
+    cursor = None
+    while True:
+        items, cursor = keyset_page(db, select(Lead), Lead.created_at, Lead.id, cursor, limit=3)
+        seen.extend(lead.id for lead in items)
+        if cursor is None:
+            break
+    assert seen == sorted(seen, reverse=True)
+    assert len(seen) == len(set(seen)) == 7
+
+
+def test_keyset_page_applies_filters_and_rejects_bad_cursor(db):
+    db.add(Lead(name="A", email="a@org.com", niche="SaaS", status=LeadStatus.new))
+    db.add(Lead(name="B", email="b@org.com", niche="Retail", status=LeadStatus.new))
+    db.commit()
+
+    items, cursor = keyset_page(db, select(Lead).where(Lead.niche == "SaaS"), Lead.created_at, Lead.id)
+    assert [lead.email for lead in items] == ["a@org.com"]
+    assert cursor is None
+
+    with pytest.raises(ValueError):
+        keyset_page(db, select(Lead), Lead.created_at, Lead.id, cursor="not-a-cursor")
@@ -0,0 +1,91 @@
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.entities import EmailMessage, EmailType, ReplyMessage
+from app.services.campaign_service import CampaignService
+from app.services.lead_importer import LeadImporter
+from app.services.reply_scheduler import ReplyAutoSendWorker
+
+
+def _replied_leads(factory, monkeypatch):
+    monkeypatch.setattr(settings, "reply_auto_send_enabled", True)
+    db = factory()
+    LeadImporter(db).import_rows([{"name": "A", "email": "a@org.com"}, {"name": "B", "email": "b@org.com"}])
+    service = CampaignService(db)
+    service.seed_templates("book calls", "SaaS")
+    service.send_outreach_batch(limit=2)
+    return db, service
+
+
+def test_worker_rebuilds_heap_and_sends_only_due_drafts(session_factory, monkeypatch):
+    db, service = _replied_leads(session_factory, monkeypatch)
+    service.process_incoming_reply("a@org.com", "Yes, interested. Let's schedule.")
+    service.process_incoming_reply("b@org.com", "Not interested, remove me.")
+
+    worker = ReplyAutoSendWorker(session_factory=session_factory)
+    assert worker.rebuild() == 1
+    assert worker.run_due(datetime.utcnow()) == 0
+
+    later = datetime.utcnow() + timedelta(minutes=settings.reply_auto_send_delay_minutes + 1)
+    assert worker.run_due(later) == 1
+    assert worker.pending() == 0
+    sent = db.scalars(select(EmailMessage).where(EmailMessage.email_type == EmailType.reply)).all()
+    assert len(sent) == 1
+
+
+def test_newer_reply_and_manual_edit_cancel_auto_send(session_factory, monkeypatch):
+    db, service = _replied_leads(session_factory, monkeypatch)
+    service.process_incoming_reply("a@org.com", "Maybe, tell me more.")
+    service.process_incoming_reply("a@org.com", "Actually yes, interested.")
+    first, second = db.scalars(select(ReplyMessage).order_by(ReplyMessage.id)).all()
+    assert first.auto_send_due_at is None
+    assert second.auto_send_due_at is not None
+
+    assert service.edit_suggested_reply(second.id, "Re: times", "How about Tuesday?")
+    worker = ReplyAutoSendWorker(session_factory=session_factory)
+    assert worker.rebuild() == 0
+
+
+
+class RacingGateway:
+    """Runs a competing send attempt from another session while this send is in flight."""
+
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+        self.compete = None
+
+    def send(self, to_email: str, subject: str, body: str, sender: str) -> str:
+        self.sent.append(to_email)
+        if self.compete is not None:
+            compete, self.compete = self.compete, None
+            compete()
+        return str(uuid.uuid4())
+
+
+def test_due_draft_is_sent_once_when_two_sessions_race(session_factory, monkeypatch):
+    db, service = _replied_leads(session_factory, monkeypatch)
+    service.process_incoming_reply("a@org.com", "Yes, interested. Let's schedule.")
+    reply_id = db.scalar(select(ReplyMessage.id))
+    later = datetime.utcnow() + timedelta(minutes=settings.reply_auto_send_delay_minutes + 1)
+    gateway = RacingGateway()
+
+    # Two workers that both read the draft as pending before either sends it.
+    first_db, second_db = session_factory(), session_factory()
+    first_db.get(ReplyMessage, reply_id)
+    second_db.get(ReplyMessage, reply_id)
+    first = CampaignService(first_db, email_gateway=gateway)
+    second = CampaignService(second_db, email_gateway=gateway)
+    approver = CampaignService(session_factory(), email_gateway=gateway)
+    results = []
+    gateway.compete = lambda: results.extend(
+        [second.send_due_reply(reply_id, later), approver.approve_and_send_suggested_reply(1)]
+    )
+
+    assert first.send_due_reply(reply_id, later) is True
+    assert results == [False, False]
+    assert gateway.sent == ["a@org.com"]
+    sent = db.scalars(select(EmailMessage).where(EmailMessage.email_type == EmailType.reply)).all()
+    assert len(sent) == 1
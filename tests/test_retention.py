@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app.models.entities import Alert, AlertDailyRollup, EmailMessage, ReplyMessage
+from app.services.campaign_service import CampaignService
+from app.services.lead_importer import LeadImporter
+from app.services.retention import RetentionService
+
+
+def test_old_alerts_roll_up_into_daily_counts_in_batches(db):
+    old = datetime(2024, 1, 3, 9, 0)
+    for i in range(5):
+        db.add(Alert(severity="info", message=f"old {i}", created_at=old + timedelta(minutes=i)))
+    db.add(Alert(severity="info", message="fresh"))
+    db.commit()
+
+    rolled = RetentionService(db, batch_size=2).rollup_alerts(datetime(2024, 2, 1))
+
+    assert rolled == 5
+    assert [a.message for a in db.scalars(select(Alert)).all()] == ["fresh"]
+    rollup = db.scalar(select(AlertDailyRollup))
+    assert (rollup.day, rollup.severity, rollup.count) == ("2024-01-03", "info", 5)
+
+
+def test_cold_messages_move_to_queryable_archive(db):
+    LeadImporter(db).import_rows([{"name": "Alice", "email": "alice@acme.com", "company": "Acme"}])
+    service = CampaignService(db)
+    service.seed_templates("get demos", "SaaS")
+    service.send_outreach_batch(limit=1)
+    service.process_incoming_reply("alice@acme.com", "Yes, interested")
+
+    result = RetentionService(db).run(now=datetime.utcnow() + timedelta(days=365))
+
+    assert result.email_messages_archived == 1
+    assert result.reply_messages_archived == 1
+    assert db.scalar(select(func.count()).select_from(EmailMessage)) == 0
+    assert db.scalar(select(func.count()).select_from(ReplyMessage)) == 0
+    archived = RetentionService(db).archived_messages(lead_id=1)
+    assert [item["source"] for item in archived] == ["email_messages", "reply_messages"]
+    assert archived[0]["body"].startswith("Hi Alice,")
@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import update
+
+from app.db.search_index import ensure_search_index
+from app.models.entities import Lead
+from app.services.campaign_service import CampaignService
+from app.services.lead_importer import LeadImporter
+from app.services.search import SearchService, fts5_query
+
+
+@pytest.fixture
+def db(db):
+    ensure_search_index(db.get_bind())
+    return db
+
+
+def test_fts5_query_quotes_tokens_and_prefixes_last():
+    assert fts5_query('acme "OR" data-eng') == '"acme" "OR" "data" "eng"*'
+    assert fts5_query("  !! ") is None
+
+
+def test_lead_search_ranks_name_and_company_and_tracks_updates(db):
+    LeadImporter(db).import_rows(
+        [
+            {"name": "Dana Stark", "email": "dana@acme.com", "company": "Acme Robotics", "niche": "Manufacturing"},
+            {"name": "Lee Wong", "email": "lee@globex.com", "company": "Globex", "position": "Robotics Lead"},
+            {"name": "Ira Patel", "email": "ira@initech.com", "company": "Initech", "niche": "Fintech"},
+        ]
+    )
+    search = SearchService(db)
+
+    assert [lead.email for lead in search.search_leads("robot")] == ["dana@acme.com", "lee@globex.com"]
+    assert [lead.email for lead in search.search_leads("fintech")] == ["ira@initech.com"]
+
+    db.execute(update(Lead).where(Lead.email == "ira@initech.com").values(company="Robotic Payments"))
+    db.commit()
+    assert "ira@initech.com" in [lead.email for lead in search.search_leads("robotic")]
+
+
+def test_reply_search_finds_mentions_with_stemming(db):
+    LeadImporter(db).import_rows([{"name": "Ann", "email": "ann@org.com"}])
+    service = CampaignService(db)
+    service.process_incoming_reply("ann@org.com", "We are already using Globex for this, sorry.")
+    service.process_incoming_reply("ann@org.com", "Interested, can we schedule?")
+
+    hits = SearchService(db).search_replies("globex uses")
+    assert [r.raw_body for r in hits] == ["We are already using Globex for this, sorry."]
@@ -0,0 +1,39 @@
+import pytest
+
+from app.core.simulation import SimulationError, SimulationProfile, Simulator, parse_simulation_config
+from app.services.email_gateway import SimulatedEmailGateway
+
+
+def _outcomes(simulator: Simulator, calls: int) -> list[str]:
+    out = []
+    for _ in range(calls):
+        try:
+            simulator.run()
+            out.append("ok")
+        except SimulationError as exc:
+            out.append(exc.kind)
+    return out
+
+
+def test_seeded_simulators_are_deterministic():
+    profile = SimulationProfile(latency_median_ms=5, error_rate=0.3, timeout_rate=0.1, seed=42)
+    sleeps_a: list[float] = []
+    sleeps_b: list[float] = []
+    a = _outcomes(Simulator(profile, sleep=sleeps_a.append), 50)
+    b = _outcomes(Simulator(profile, sleep=sleeps_b.append), 50)
+    assert a == b
+    assert sleeps_a == sleeps_b
+    assert {"ok", "error", "timeout"} <= set(a)
+
+
+def test_rate_limit_window_rejects_excess_calls():
+    simulator = Simulator(SimulationProfile(rate_limit=3, rate_limit_window_s=60), sleep=lambda _: None)
+    assert _outcomes(simulator, 5) == ["ok", "ok", "ok", "rate_limited", "rate_limited"]
+
+
+def test_simulated_gateway_from_config():
+    config = parse_simulation_config('{"gateway": {"error_rate": 1.0, "seed": 1}}')
+    assert config["provider"] is None
+    gateway = SimulatedEmailGateway(config["gateway"])
+    with pytest.raises(SimulationError):
+        gateway.send("a@b.com", "s", "b", "me@b.com")
@@ -0,0 +1,73 @@
+import random
+
+
+from app.models.entities import EmailMessage, EmailTemplate, EmailType, Sentiment, TemplateStats
+from app.services.campaign_service import CampaignService
+from app.services.lead_importer import LeadImporter
+from app.services.template_stats import TemplateStatsService
+
+
+def _template(template_id: int) -> EmailTemplate:
+    return EmailTemplate(
+        id=template_id,
+        name=f"t{template_id}",
+        email_type=EmailType.outreach,
+        objective="o",
+        subject_template="s",
+        body_template="b",
+    )
+
+
+def test_stats_follow_sends_replies_and_opt_outs(db):
+    LeadImporter(db).import_rows([{"name": f"L{i}", "email": f"l{i}@org.com"} for i in range(4)])
+    service = CampaignService(db, rng=random.Random(3))
+    service.seed_templates("book calls", "SaaS")
+    assert service.send_outreach_batch(limit=4) == 4
+
+    replied = db.query(EmailMessage).filter(EmailMessage.lead.has(email="l0@org.com")).one()
+    service.process_incoming_reply("l0@org.com", "Yes, let's schedule a call.")
+    service.process_incoming_reply("l0@org.com", "Also, Tuesday works.")
+    service.unsubscribe("l1@org.com")
+
+    stats = {row.template_id: row for row in db.query(TemplateStats).all()}
+    assert sum(row.sends for row in stats.values()) == 4
+    assert sum(row.replies for row in stats.values()) == 1
+    assert sum(row.opt_outs for row in stats.values()) == 1
+    assert stats[replied.template_id].positive_replies == 1
+
+    template = db.get(EmailTemplate, replied.template_id)
+    db.refresh(template)
+    assert template.conversion_score == 1 / stats[replied.template_id].sends
+    best = TemplateStatsService(db).best()
+    assert best[0]["template_id"] == replied.template_id
+
+
+def test_thompson_sampling_favours_the_converting_template(db):
+    proven, weak, fresh = _template(1), _template(2), _template(3)
+    proven_stats = TemplateStats(template_id=1, sends=200, positive_replies=30, neutral_replies=10)
+    weak_stats = TemplateStats(template_id=2, sends=200, positive_replies=2, neutral_replies=0)
+    selector = TemplateStatsService(db, random.Random(11))
+
+    picks = [selector.choose([(proven, proven_stats), (weak, weak_stats)]).id for _ in range(500)]
+    assert picks.count(2) < 5
+
+    # A template with no sends yet still gets explored against proven ones.
+    picks = [selector.choose([(proven, proven_stats), (fresh, None)]).id for _ in range(500)]
+    assert 0 < picks.count(3) < 500
+
+
+def test_first_sends_from_concurrent_batches_are_merged(session_factory):
+    setup = session_factory()
+    setup.add(_template(1))
+    setup.commit()
+
+    # Neither writer has seen a stats row for the template; both must create-or-add.
+    first, second = session_factory(), session_factory()
+    TemplateStatsService(first).record_sends({1: 2})
+    first.commit()
+    TemplateStatsService(second).record_sends({1: 3})
+    TemplateStatsService(second).record_reply(1, Sentiment.positive, 60.0)
+    second.commit()
+
+    stats = session_factory().get(TemplateStats, 1)
+    assert (stats.sends, stats.replies, stats.positive_replies) == (5, 1, 1)